@@ -6,12 +6,14 @@ from typing import Any, Dict, Tuple
 from pydantic import ValidationError
 
 import time
+import logging
+import threading
 
 from app.tools.profile_tools import (
     fetch_email_and_address,
     fetch_contact_preference,
 )
-from app.telemetry.tracing import get_current_trace
+from app.telemetry.tracing import get_current_trace, end_span, start_timings, pop_timings
 
 # utils
 from app.utils.intent import classify_intent
@@ -21,6 +23,8 @@ from app.utils.builders import (
     build_preferences_output,
 )
 
+logger = logging.getLogger(__name__)
+
 MODEL_ID = "us.anthropic.claude-sonnet-4-20250514-v1:0"
 
 def create_profile_agent() -> Agent:
@@ -31,10 +35,36 @@ def create_profile_agent() -> Agent:
         record_direct_tool_call=False,
     )
 
+_agents = threading.local()
+
+def get_profile_agent() -> Agent:
+    """Return this thread's cached agent, building it on first use."""
+    agent = getattr(_agents, "agent", None)
+    if agent is None:
+        agent = _agents.agent = create_profile_agent()
+    return agent
+
+def _build_email_address(member_id: str, raw: Dict[str, Any]):
+    return build_email_address_output(
+        member_id,
+        raw.get("email_json"),
+        raw.get("address_json"),
+    )
+
+def _build_preferences(member_id: str, raw: Dict[str, Any]):
+    return build_preferences_output(member_id, raw.get("preferences_json"))
+
+# intent -> (response schema name, builder); anything else is treated as preferences
+_ROUTES = {
+    "fetch_email_and_address": ("ProfileOverviewResponse", _build_email_address),
+    "fetch_contact_preference": ("PreferencesOverviewResponse", _build_preferences),
+}
+
 def handle_request(*, query: str, member_id: str) -> Tuple[str, Dict[str, Any]]:
     """
     Routes the query, calls the right tool, builds a validated response,
-    emits Langfuse v3 spans when a client is available, and prints timing.
+    emits Langfuse v3 spans when a client is available, and logs one
+    aggregated timing record.
     """
     client = get_current_trace()  # Langfuse v3 client or None
     span_outer = client.start_span(
@@ -42,128 +72,63 @@ def handle_request(*, query: str, member_id: str) -> Tuple[str, Dict[str, Any]]:
         input={"query": query, "member_id": member_id},
     ) if client else None
 
+    timing_token = start_timings()  # tool helpers add their step timings here
     t0 = time.perf_counter()
-    agent = create_profile_agent()
+    agent = get_profile_agent()
     t_agent = time.perf_counter()
 
     intent = classify_intent(query)
+    tool_name = intent if intent in _ROUTES else "fetch_contact_preference"
+    schema, build = _ROUTES[tool_name]
 
-    if intent == "fetch_email_and_address":
-        # tool span
-        span_tool = client.start_span(
-            name="tool_call",
-            input={"tool": "fetch_email_and_address", "member_id": member_id},
-        ) if client else None
-
-        t_tool0 = time.perf_counter()
-        raw = agent.tool.fetch_email_and_address(
-            member_id=member_id,
-            record_direct_tool_call=False,
-        )
-        t_tool1 = time.perf_counter()
-        if span_tool:
-            try:
-                span_tool.end(output={"status": "ok", "ms": round((t_tool1 - t_tool0) * 1000, 1)})
-            except Exception:
-                pass
-
-        raw = unwrap_tool_result(raw)
-
-        # build span
-        span_build = client.start_span(
-            name="build_output",
-            input={"schema": "ProfileOverviewResponse"},
-        ) if client else None
-
-        t_build0 = time.perf_counter()
-        try:
-            out = build_email_address_output(
-                member_id,
-                raw.get("email_json"),
-                raw.get("address_json"),
-            )
-        except ValidationError as ve:
-            if span_build:
-                try:
-                    span_build.end(output={"status": "validation_error", "message": str(ve)[:500]})
-                except Exception:
-                    pass
-            raise RuntimeError(f"Validation failed for ProfileOverviewResponse: {ve}") from ve
-        t_end = time.perf_counter()
-
-        if span_build:
-            try:
-                span_build.end(output={"status": "ok", "ms": round((t_end - t_build0) * 1000, 1)})
-            except Exception:
-                pass
-
-        print(
-            f"[timing] handle_request[{intent}]: "
-            f"agent_init={(t_agent - t0)*1000:.1f} ms, "
-            f"tool={(t_tool1 - t_tool0)*1000:.1f} ms, "
-            f"build={(t_end - t_build0)*1000:.1f} ms, "
-            f"total={(t_end - t0)*1000:.1f} ms"
-        )
-        if span_outer:
-            try:
-                span_outer.end(output={"intent": intent, "total_ms": round((t_end - t0) * 1000, 1)})
-            except Exception:
-                pass
-        return intent, out.model_dump()
-
-    # preferences branch
+    # tool span
     span_tool = client.start_span(
         name="tool_call",
-        input={"tool": "fetch_contact_preference", "member_id": member_id},
+        input={"tool": tool_name, "member_id": member_id},
     ) if client else None
 
     t_tool0 = time.perf_counter()
-    raw = agent.tool.fetch_contact_preference(
+    raw = getattr(agent.tool, tool_name)(
         member_id=member_id,
         record_direct_tool_call=False,
     )
     t_tool1 = time.perf_counter()
     if span_tool:
-        try:
-            span_tool.end(output={"status": "ok", "ms": round((t_tool1 - t_tool0) * 1000, 1)})
-        except Exception:
-            pass
+        end_span(span_tool, status="ok", ms=round((t_tool1 - t_tool0) * 1000, 1))
 
     raw = unwrap_tool_result(raw)
 
+    # build span
     span_build = client.start_span(
         name="build_output",
-        input={"schema": "PreferencesOverviewResponse"},
+        input={"schema": schema},
     ) if client else None
 
     t_build0 = time.perf_counter()
     try:
-        out = build_preferences_output(member_id, raw.get("preferences_json"))
+        out = build(member_id, raw)
     except ValidationError as ve:
         if span_build:
-            try:
-                span_build.end(output={"status": "validation_error", "message": str(ve)[:500]})
-            except Exception:
-                pass
-        raise RuntimeError(f"Validation failed for PreferencesOverviewResponse: {ve}") from ve
+            end_span(span_build, status="validation_error", message=str(ve)[:500])
+        raise RuntimeError(f"Validation failed for {schema}: {ve}") from ve
     t_end = time.perf_counter()
 
     if span_build:
-        try:
-            span_build.end(output={"status": "ok", "ms": round((t_end - t_build0) * 1000, 1)})
-        except Exception:
-            pass
-
-    print(
-        f"[timing] handle_request[{intent}]: "
-        f"agent_init={(t_agent - t0)*1000:.1f} ms, "
-        f"tool={(t_tool1 - t_tool0)*1000:.1f} ms, "
-        f"build={(t_end - t_build0)*1000:.1f} ms, "
-        f"total={(t_end - t0)*1000:.1f} ms"
+        end_span(span_build, status="ok", ms=round((t_end - t_build0) * 1000, 1))
+
+    timings = pop_timings(timing_token)
+    timings.update(
+        agent_init=round((t_agent - t0) * 1000, 1),
+        tool=round((t_tool1 - t_tool0) * 1000, 1),
+        build=round((t_end - t_build0) * 1000, 1),
+        total=round((t_end - t0) * 1000, 1),
+    )
+    logger.info(
+        "[timing] handle_request[%s]: %s", intent, timings,
+        extra={f"{k}_ms": v for k, v in timings.items()},
     )
     if span_outer:
-        try:
-            span_outer.end(output={"intent": intent, "total_ms": round((t_end - t0) * 1000, 1)})
-        except Exception:
-            pass
-    return intent, out.model_dump()
+        end_span(span_outer, intent=intent, total_ms=timings["total"])
+    # callers embed the payload in a larger response, so a dict is still needed;
+    # dropping None fields keeps it (and the final JSON) smaller
+    return intent, out.model_dump(exclude_none=True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import List, Optional, Dict, Any
-import re, time
+import re, time, logging
 
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -14,6 +14,8 @@ load_dotenv()
 
 from langfuse import get_client  # v3 API
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Profile Agent A2A", version="0.1.0")
 
 # Diagnostics endpoints (unchanged signatures)
@@ -97,7 +99,7 @@ async def a2a_messages(msg: Message) -> Dict[str, Any]:
     finally:
         reset_current_trace(token)
     t1 = time.perf_counter()
-    print(f"[timing] /a2a/messages total={(t1 - t0)*1000:.1f} ms query='{text[:80]}'")
+    logger.debug("[timing] /a2a/messages total=%.1f ms query=%r", (t1 - t0) * 1000, text[:80])
 
     return {
         "kind": "message",
@@ -1,8 +1,9 @@
 # app/telemetry/tracing.py
 from __future__ import annotations
 import os
+import logging
 import contextvars
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 try:
     # v3 SDK
@@ -12,7 +13,10 @@ except Exception:
     def get_client():  # type: ignore
         return None
 
+logger = logging.getLogger(__name__)
+
 _current_client: contextvars.ContextVar[Any] = contextvars.ContextVar("lf_client", default=None)
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("timings", default=None)
 _initialized = False
 _last_error: Optional[str] = None
 _debug = os.getenv("LANGFUSE_DEBUG") in {"1", "true", "True", "YES", "yes"}
@@ -67,6 +71,37 @@ def reset_current_trace(token) -> None:
     except Exception:
         pass
 
+def end_span(span: Any, **output) -> None:
+    """End a Langfuse span with the given output; never raises, no-op for None."""
+    if span is None:
+        return
+    try:
+        span.end(output=output)
+    except Exception:
+        pass
+
+# ---------- Request timings ----------
+
+def start_timings():
+    """Begin collecting per-step timings for the current request; returns a reset token."""
+    return _timings.set({})
+
+def record_timing(name: str, ms: float) -> None:
+    """Add a step timing to the current request (no-op outside start_timings)."""
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = round(ms, 1)
+    logger.debug("[timing] %s: %.1f ms", name, ms)
+
+def pop_timings(token) -> Dict[str, float]:
+    """Return the collected timings and stop collecting."""
+    timings = _timings.get() or {}
+    try:
+        _timings.reset(token)
+    except Exception:
+        pass
+    return timings
+
 # ---------- Diagnostics ----------
 
 def is_client_ready() -> bool:
@@ -1,11 +1,12 @@
 from __future__ import annotations
 import os
 import asyncio
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Tuple
 # import httpx # commented out because we are mocking all API calls
 from strands import tool
 import time
-from app.telemetry.tracing import get_current_trace
+from app.telemetry.tracing import get_current_trace, end_span, record_timing
 
 # ------------------------------------------------------------------
 # Config
@@ -15,6 +16,22 @@ API_KEY = os.getenv("PROFILE_API_KEY", "tbd")
 BASIC_AUTH = os.getenv("PROFILE_BASIC_AUTH", "tbd")
 SCOPE = os.getenv("PROFILE_SCOPE", "public")
 PREF_USERNM = os.getenv("PROFILE_USERNM", "test")
+TOKEN_TTL_S = float(os.getenv("PROFILE_TOKEN_TTL_S", "900"))  # used when the token response has no expires_in
+
+
+# ------------------------------------------------------------------
+# Shared event loop (one per process, reused by every tool call)
+# ------------------------------------------------------------------
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name="profile-tools-loop", daemon=True).start()
+
+# Bound to _LOOP so TCP/TLS sessions survive across tool calls
+# _HTTP = httpx.AsyncClient(timeout=20)
+
+
+def _run(coro):
+    """Run a coroutine on the shared loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
 
 
 # ------------------------------------------------------------------
@@ -67,9 +84,26 @@ PREFS = {
 # ------------------------------------------------------------------
 # Mocked HTTP helpers (commented out httpx calls)
 # ------------------------------------------------------------------
-async def _get_access_token_async() -> str:
-    client = get_current_trace()
-    span = client.start_span(name="access_token") if client else None
+_TOKEN_CACHE: Dict[str, Any] = {"token": None, "exp": 0.0}
+_TOKEN_LOCK = asyncio.Lock()  # only ever awaited on _LOOP
+
+
+async def _get_access_token_async(trace: Any = None) -> str:
+    """Return a cached access token, refreshing it shortly before it expires."""
+    if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["exp"] - 30:
+        return _TOKEN_CACHE["token"]
+    async with _TOKEN_LOCK:
+        # another caller may have refreshed while we waited
+        if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["exp"] - 30:
+            return _TOKEN_CACHE["token"]
+        token, ttl = await _fetch_access_token_async(trace)
+        _TOKEN_CACHE["token"] = token
+        _TOKEN_CACHE["exp"] = time.monotonic() + ttl
+        return token
+
+
+async def _fetch_access_token_async(trace: Any = None) -> Tuple[str, float]:
+    span = trace.start_span(name="access_token") if trace else None
     t0 = time.perf_counter()
 # url = f"{API_BASE}/v1/oauth/accesstoken"
 # headers = {
@@ -78,65 +112,55 @@ async def _get_access_token_async() -> str:
 # "Content-Type": "application/x-www-form-urlencoded",
 # }
 # data = {"grant_type": "client_credentials", "scope": SCOPE}
-# async with httpx.AsyncClient() as client:
-# r = await client.post(url, headers=headers, data=data, timeout=20)
+# r = await _HTTP.post(url, headers=headers, data=data, timeout=20)
 # r.raise_for_status()
-# token = r.json().get("access_token")
-# return token or ""
+# js = r.json()
+# return js.get("access_token") or "", float(js.get("expires_in") or TOKEN_TTL_S)
     dt = (time.perf_counter() - t0) * 1000
-    print(f"[timing] access_token: {dt:.1f} ms")
-    if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
-    return ACCESS["access_token"]
-
+    record_timing("access_token", dt)
+    if span: end_span(span, status="ok", ms=round(dt, 1))
+    return ACCESS["access_token"], TOKEN_TTL_S
 
-async def _get_email_async(member_id: str, bearer: str) -> Dict[str, Any]:
-    client = get_current_trace()
-    span = client.start_span(name="get_email", input={"member_id": member_id}) if client else None
 
+async def _get_email_async(member_id: str, bearer: str, trace: Any = None) -> Dict[str, Any]:
+    span = trace.start_span(name="get_email", input={"member_id": member_id}) if trace else None
     t0 = time.perf_counter()
 # url = f"{API_BASE}/genai/v1/{member_id}/email"
 # headers = {"apikey": API_KEY, "Authorization": f"Bearer {bearer}"}
-# async with httpx.AsyncClient() as client:
-# r = await client.get(url, headers=headers, timeout=20)
+# r = await _HTTP.get(url, headers=headers, timeout=20)
 # r.raise_for_status()
 # return r.json()
     dt = (time.perf_counter() - t0) * 1000
-    print(f"[timing] email: {dt:.1f} ms")
-    if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
+    record_timing("email", dt)
+    if span: end_span(span, status="ok", ms=round(dt, 1))
     return EMAIL
 
 
-async def _get_address_async(member_id: str, bearer: str) -> Dict[str, Any]:
-    trace = get_current_trace()
-    client = get_current_trace()
-    span = client.start_span(name="get_address", input={"member_id": member_id}) if client else None
+async def _get_address_async(member_id: str, bearer: str, trace: Any = None) -> Dict[str, Any]:
+    span = trace.start_span(name="get_address", input={"member_id": member_id}) if trace else None
     t0 = time.perf_counter()
 # url = f"{API_BASE}/genai/v1/{member_id}/address"
 # headers = {"apikey": API_KEY, "Authorization": f"Bearer {bearer}"}
-# async with httpx.AsyncClient() as client:
-# r = await client.get(url, headers=headers, timeout=20)
+# r = await _HTTP.get(url, headers=headers, timeout=20)
 # r.raise_for_status()
 # return r.json()
     dt = (time.perf_counter() - t0) * 1000
-    print(f"[timing] address: {dt:.1f} ms")
-    if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
+    record_timing("address", dt)
+    if span: end_span(span, status="ok", ms=round(dt, 1))
     return ADDR
 
 
-async def _get_preferences_async(member_id: str, bearer: str) -> Dict[str, Any]:
-    trace = get_current_trace()
-    client = get_current_trace()
-    span = client.start_span(name="get_preferences", input={"member_id": member_id}) if client else None
+async def _get_preferences_async(member_id: str, bearer: str, trace: Any = None) -> Dict[str, Any]:
+    span = trace.start_span(name="get_preferences", input={"member_id": member_id}) if trace else None
     t0 = time.perf_counter()
 # url = f"{API_BASE}/genai/v1/{member_id}/preferences"
 # headers = {"apikey": API_KEY, "Authorization": f"Bearer {bearer}", "usernm": PREF_USERNM}
-# async with httpx.AsyncClient() as client:
-# r = await client.get(url, headers=headers, timeout=20)
+# r = await _HTTP.get(url, headers=headers, timeout=20)
 # r.raise_for_status()
 # return r.json()
     dt = (time.perf_counter() - t0) * 1000
-    print(f"[timing] preferences: {dt:.1f} ms")
-    if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
+    record_timing("preferences", dt)
+    if span: end_span(span, status="ok", ms=round(dt, 1))
     return PREFS
 
 # ------------------------------------------------------------------
@@ -148,15 +172,18 @@ def fetch_email_and_address(*, member_id: str) -> Dict[str, Any]:
         client = get_current_trace()
         span = client.start_span(name="tool.fetch_email_and_address", input={"member_id": member_id}) if client else None
         t0 = time.perf_counter()
-        token = await _get_access_token_async()
-        email_json = await _get_email_async(member_id, token)     # returns EMAIL mock
-        address_json = await _get_address_async(member_id, token) # returns ADDR mock
+        token = await _get_access_token_async(client)
+        # email and address are independent once we hold a token -> run concurrently
+        email_json, address_json = await asyncio.gather(
+            _get_email_async(member_id, token, client),    # returns EMAIL mock
+            _get_address_async(member_id, token, client),  # returns ADDR mock
+        )
         dt = (time.perf_counter() - t0) * 1000
-        print(f"[timing] fetch_email_and_address: {dt:.1f} ms")
-        if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
+        record_timing("fetch_email_and_address", dt)
+        if span: end_span(span, status="ok", ms=round(dt, 1))
         # IMPORTANT: return the keys the agent expects
         return {"email_json": email_json, "address_json": address_json}
-    return asyncio.run(run())
+    return _run(run())
 
 
 @tool
@@ -165,11 +192,11 @@ def fetch_contact_preference(*, member_id: str) -> Dict[str, Any]:
         client = get_current_trace()
         span = client.start_span(name="tool.fetch_contact_preference", input={"member_id": member_id}) if client else None
         t0 = time.perf_counter()
-        token = await _get_access_token_async()
-        prefs = await _get_preferences_async(member_id, token)    # returns PREFS mock
+        token = await _get_access_token_async(client)
+        prefs = await _get_preferences_async(member_id, token, client)    # returns PREFS mock
         dt = (time.perf_counter() - t0) * 1000
-        print(f"[timing] fetch_contact_preference: {dt:.1f} ms")
-        if span: span.end(output={"status": "ok", "ms": round(dt, 1)})
+        record_timing("fetch_contact_preference", dt)
+        if span: end_span(span, status="ok", ms=round(dt, 1))
         # IMPORTANT: return the key the agent expects
         return {"preferences_json": prefs}
-    return asyncio.run(run())
+    return _run(run())
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, Dict, List
 from collections.abc import Mapping
+from functools import lru_cache
 
 from app.schemas.profile_schemas import (
     NameValue,
@@ -19,65 +20,82 @@ from app.utils.json_utils import (
     extract_preferences_list,
 )
 
+# Response models are assembled with model_construct: inputs are our own
+# constants/extracted values, so per-field validation is skipped.
+
 def _code(x: Any):
     return (x or {}).get("code") if isinstance(x, Mapping) else None
 
+_EMAIL_JOURNEY = Journey.model_construct(
+    journey="MANAGE_PROFILE",
+    subjourney="ENSURE_VALID_PROFILE",
+    task="CHECK_PROFILE",
+    subtask="PROFILE_OVERVIEW",
+)
+_PREF_JOURNEY = Journey.model_construct(
+    journey="MANAGE_PROFILE",
+    subjourney="CONTACT_PREFERENCES",
+    task="CHECK_PREFERENCES",
+    subtask="PREFERENCES_OVERVIEW",
+)
+
+@lru_cache(maxsize=1024)
+def _header_for(member_id: str, kind: str) -> Header:
+    """Headers are read-only once built, so repeat member_ids share one."""
+    if kind == "email":
+        return Header.model_construct(
+            title=f"Your profile for {member_id}",
+            description="Profile overview with primary email and address",
+        )
+    return Header.model_construct(
+        title=f"Contact preferences for {member_id}",
+        description="Member communication and channel preferences",
+    )
+
 def build_email_address_output(
     member_id: str, email_json: Dict[str, Any], address_json: Dict[str, Any]
 ) -> ProfileOverviewResponse:
     email_first = extract_first_email(email_json) or {}
     addr_first = extract_first_address(address_json) or {}
 
-    header = Header(
-        title=f"Your profile for {member_id}",
-        description="Profile overview with primary email and address",
-    )
-    journey = Journey(
-        journey="MANAGE_PROFILE",
-        subjourney="ENSURE_VALID_PROFILE",
-        task="CHECK_PROFILE",
-        subtask="PROFILE_OVERVIEW",
-    )
+    header = _header_for(member_id, "email")
     entities: List[EntitiesEmailAddr] = [
-        EntitiesEmailAddr(name="emailUid", value=email_first.get("emailUid")),
-        EntitiesEmailAddr(name="addressUid", value=addr_first.get("addressUid")),
+        EntitiesEmailAddr.model_construct(name="emailUid", value=email_first.get("emailUid")),
+        EntitiesEmailAddr.model_construct(name="addressUid", value=addr_first.get("addressUid")),
+    ]
+    email_pairs = [
+        ("Email Address: ", email_first.get("emailAddress")),
+    ]
+    address_pairs = [
+        ("Address Type Cd", _code(addr_first.get("addressTypeCd"))),
+        ("Address Line One: ", addr_first.get("addressLineOne")),
+        ("Care Of: ", addr_first.get("careOf")),
+        ("City: ", addr_first.get("city")),
+        ("StateCd: ", _code(addr_first.get("stateCd"))),
+        ("CountryCd: ", _code(addr_first.get("countryCd"))),
+        ("CountyCd: ", _code(addr_first.get("countyCd"))),
+        ("ZipCd: ", addr_first.get("zipCd")),
+        ("ZipCdExt: ", addr_first.get("zipCdExt")),
     ]
-    data = EmailAddressBlock(
-        email=[NameValue(name="Email Address: ", value=email_first.get("emailAddress"))],
-        address=[
-            NameValue(name="Address Type Cd", value=_code(addr_first.get("addressTypeCd"))),
-            NameValue(name="Address Line One: ", value=addr_first.get("addressLineOne")),
-            NameValue(name="Care Of: ", value=addr_first.get("careOf")),
-            NameValue(name="City: ", value=addr_first.get("city")),
-            NameValue(name="StateCd: ", value=_code(addr_first.get("stateCd"))),
-            NameValue(name="CountryCd: ", value=_code(addr_first.get("countryCd"))),
-            NameValue(name="CountyCd: ", value=_code(addr_first.get("countyCd"))),
-            NameValue(name="ZipCd: ", value=addr_first.get("zipCd")),
-            NameValue(name="ZipCdExt: ", value=addr_first.get("zipCdExt")),
-        ],
+    # rows with no value are omitted rather than emitted as empty entries
+    data = EmailAddressBlock.model_construct(
+        email=[NameValue.model_construct(name=n, value=v) for n, v in email_pairs if v is not None],
+        address=[NameValue.model_construct(name=n, value=v) for n, v in address_pairs if v is not None],
     )
-    return ProfileOverviewResponse(
-        user_journey=journey, header=header, entities=entities, data=data
+    return ProfileOverviewResponse.model_construct(
+        user_journey=_EMAIL_JOURNEY, header=header, entities=entities, data=data
     )
 
 def build_preferences_output(
     member_id: str, preferences_json: Dict[str, Any]
 ) -> PreferencesOverviewResponse:
     items = extract_preferences_list(preferences_json) or []
-    header = Header(
-        title=f"Contact preferences for {member_id}",
-        description="Member communication and channel preferences",
-    )
-    journey = Journey(
-        journey="MANAGE_PROFILE",
-        subjourney="CONTACT_PREFERENCES",
-        task="CHECK_PREFERENCES",
-        subtask="PREFERENCES_OVERVIEW",
-    )
+    header = _header_for(member_id, "preferences")
     entities: List[EntitiesEmailAddr] = [
-        EntitiesEmailAddr(name="preferenceCount", value=str(len(items)))
+        EntitiesEmailAddr.model_construct(name="preferenceCount", value=str(len(items)))
     ]
-    data = PreferencesData(preferences=[PreferenceItem(**it) for it in items])
-    return PreferencesOverviewResponse(
-        user_journey=journey, header=header, entities=entities, data=data
+    # upstream preference items are still validated; everything else is built from trusted values
+    data = PreferencesData.model_construct(preferences=[PreferenceItem(**it) for it in items])
+    return PreferencesOverviewResponse.model_construct(
+        user_journey=_PREF_JOURNEY, header=header, entities=entities, data=data
     )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 import os
+import logging
 from app.utils.intent_keywords import classify_intent_keywords
 from app.utils.intent_llm import classify_intent_llm
 
+logger = logging.getLogger(__name__)
+
 def classify_intent(query: str) -> str:
     """
     Dynamic classifier controlled by env:
@@ -11,7 +14,7 @@ def classify_intent(query: str) -> str:
     """
     mode = (os.getenv("INTENT_CLASSIFIER") or "keywords").strip().lower()
     if mode == "llm":
-        print(f"[intent] using llm: {mode}")
+        logger.debug("[intent] using llm: %s", mode)
         return classify_intent_llm(query)
-    print(f"[intent] using keywords: {mode}")
+    logger.debug("[intent] using keywords: %s", mode)
     return classify_intent_keywords(query)
@@ -1,4 +1,90 @@
 from __future__ import annotations
+import re
+from typing import Optional
+
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None  # type: ignore
+
+_EMAIL_ADDR_KEYWORDS = (
+    "email",
+    "e-mail",
+    "mail id",
+    "postal address",
+    "mailing address",
+    "address",
+    "zip",
+    "city",
+    "state",
+)
+_PREF_KEYWORDS = (
+    "preference",
+    "preferences",
+    "contact method",
+    "notifications",
+    "sms",
+    "text",
+    "eob",
+    "language",
+    "digital wallet",
+)
+
+# Fallback: a single regex scan per keyword group instead of N substring scans
+_EMAIL_ADDR_RE = re.compile("|".join(map(re.escape, _EMAIL_ADDR_KEYWORDS)))
+_PREF_RE = re.compile("|".join(map(re.escape, _PREF_KEYWORDS)))
+# Whole-word variants for the LLM fast path, so "statement" or "context"
+# don't count as "state" / "text" hits
+_EMAIL_ADDR_WORD_RE = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, _EMAIL_ADDR_KEYWORDS)))
+_PREF_WORD_RE = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, _PREF_KEYWORDS)))
+
+
+def _build_automaton():
+    """One-pass multi-keyword matcher; None when pyahocorasick is missing."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for w in _EMAIL_ADDR_KEYWORDS:
+        automaton.add_word(w, ("email", len(w)))
+    for w in _PREF_KEYWORDS:
+        automaton.add_word(w, ("pref", len(w)))
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton()
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _on_word_boundary(q: str, end: int, length: int) -> bool:
+    """True when q[end - length + 1 : end + 1] is not part of a longer word."""
+    start = end - length + 1
+    return (start == 0 or not _is_word_char(q[start - 1])) and (
+        end + 1 == len(q) or not _is_word_char(q[end + 1])
+    )
+
+
+def _keyword_hits(query: str, whole_words: bool = False):
+    """Return (email_addr_hits, pref_hits) for the query.
+
+    By default keywords match as substrings; with whole_words they must sit on
+    word boundaries.
+    """
+    q = (query or "").lower()
+    if _AUTOMATON is not None:
+        hits = {
+            kind
+            for end, (kind, length) in _AUTOMATON.iter(q)
+            if not whole_words or _on_word_boundary(q, end, length)
+        }
+        return "email" in hits, "pref" in hits
+    if whole_words:
+        return _EMAIL_ADDR_WORD_RE.search(q) is not None, _PREF_WORD_RE.search(q) is not None
+    return _EMAIL_ADDR_RE.search(q) is not None, _PREF_RE.search(q) is not None
+
 
 def classify_intent_keywords(query: str) -> str:
     """
@@ -7,39 +93,22 @@ def classify_intent_keywords(query: str) -> str:
       - "fetch_email_and_address"
       - "fetch_contact_preference"
     """
-    q = (query or "").lower()
-
-    email_addr_hits = any(
-        w in q
-        for w in [
-            "email",
-            "e-mail",
-            "mail id",
-            "postal address",
-            "mailing address",
-            "address",
-            "zip",
-            "city",
-            "state",
-        ]
-    )
-    pref_hits = any(
-        w in q
-        for w in [
-            "preference",
-            "preferences",
-            "contact method",
-            "notifications",
-            "sms",
-            "text",
-            "eob",
-            "language",
-            "digital wallet",
-        ]
-    )
+    email_addr_hits, pref_hits = _keyword_hits(query)
 
     if email_addr_hits and not pref_hits:
         return "fetch_email_and_address"
     if pref_hits and not email_addr_hits:
         return "fetch_contact_preference"
     return "fetch_email_and_address" if email_addr_hits else "fetch_contact_preference"
+
+
+def classify_intent_keywords_unambiguous(query: str) -> Optional[str]:
+    """
+    Like classify_intent_keywords, but keywords must match whole words, and
+    returns None when neither or both keyword groups match (i.e. when the
+    keyword answer is only a guess).
+    """
+    email_addr_hits, pref_hits = _keyword_hits(query, whole_words=True)
+    if email_addr_hits == pref_hits:
+        return None
+    return "fetch_email_and_address" if email_addr_hits else "fetch_contact_preference"
@@ -1,10 +1,18 @@
 from __future__ import annotations
 import os, re, json
+import logging
+import threading
 from typing import Optional
 from strands import Agent
-from app.utils.intent_keywords import classify_intent_keywords
+from app.utils.intent_keywords import (
+    classify_intent_keywords,
+    classify_intent_keywords_unambiguous,
+)
+
+logger = logging.getLogger(__name__)
 
 _ALLOWED = {"fetch_email_and_address", "fetch_contact_preference"}
+_INTENT_RE = re.compile(r"(fetch_email_and_address|fetch_contact_preference)", re.I)
 
 _SYSTEM_PROMPT = """\
 You are a router. Classify the user's request into exactly one of:
@@ -19,7 +27,11 @@ Rules:
 def _parse_intent(text: str) -> Optional[str]:
     if not text:
         return None
-    # try strict JSON first
+    # the prompt asks for the bare identifier, so check that first
+    bare = text.strip()
+    if bare in _ALLOWED:
+        return bare
+    # try strict JSON next
     try:
         obj = json.loads(text)
         if isinstance(obj, dict):
@@ -29,7 +41,7 @@ def _parse_intent(text: str) -> Optional[str]:
     except Exception:
         pass
     # then regex for the allowed tokens
-    m = re.search(r"(fetch_email_and_address|fetch_contact_preference)", text, re.I)
+    m = _INTENT_RE.search(text)
     if m:
         val = m.group(1).lower()
         return val if val in _ALLOWED else None
@@ -38,6 +50,44 @@ def _parse_intent(text: str) -> Optional[str]:
 # ---------------------------
 # Strands / Bedrock (Claude Sonnet 4)
 # ---------------------------
+_LLM_METHODS = ("run", "complete", "generate", "invoke")
+_llm_method: Optional[str] = None  # first method name that worked; resolved once
+_router_agents = threading.local()
+
+def _get_router_agent(model_id: str) -> Agent:
+    """Per-thread cached router agent, history cleared so each call is stateless."""
+    cache = getattr(_router_agents, "by_model", None)
+    if cache is None:
+        cache = _router_agents.by_model = {}
+    agent = cache.get(model_id)
+    if agent is None:
+        agent = cache[model_id] = Agent(
+            model=model_id,
+            tools=[],                     # we only need a raw completion
+            callback_handler=None,
+            record_direct_tool_call=False,
+        )
+    messages = getattr(agent, "messages", None)
+    if isinstance(messages, list):
+        messages.clear()
+    return agent
+
+def _complete(agent: Agent, prompt: str) -> Optional[str]:
+    """Call the agent's completion method, probing method names only on first use."""
+    global _llm_method
+    if _llm_method is not None:
+        return str(getattr(agent, _llm_method)(prompt))
+    for meth in _LLM_METHODS:
+        fn = getattr(agent, meth, None)
+        if callable(fn):
+            try:
+                res = fn(prompt)  # plain string prompt
+            except Exception:
+                continue
+            _llm_method = meth
+            return str(res)
+    return None
+
 def _classify_with_strands(query: str) -> Optional[str]:
     """
     Uses the Strands Agent with the Bedrock model id supplied.
@@ -50,25 +100,10 @@ def _classify_with_strands(query: str) -> Optional[str]:
     
 
     try:
-        agent = Agent(
-            model=model_id,
-            tools=[],                     # we only need a raw completion
-            callback_handler=None,
-            record_direct_tool_call=False,
-        )
+        agent = _get_router_agent(model_id)
         # Most Strands builds accept a plain text prompt; if your SDK differs, adjust here.
         prompt = _SYSTEM_PROMPT + "\n\nUser query:\n" + (query or "")
-        # Try common method names in order:
-        text = None
-        for meth in ("run", "complete", "generate", "invoke"):
-            fn = getattr(agent, meth, None)
-            if callable(fn):
-                try:
-                    res = fn(prompt)  # plain string prompt
-                    text = str(res)
-                    break
-                except Exception:
-                    continue
+        text = _complete(agent, prompt)
         if text is None:
             # Last resort: try a messages-style call if your SDK prefers that.
             run = getattr(agent, "run", None)
@@ -80,14 +115,19 @@ def _classify_with_strands(query: str) -> Optional[str]:
         intent = _parse_intent(text or "")
         return intent
     except Exception as e:
-        print(f"[intent-llm] strands classify failed: {e}")
+        logger.warning("[intent-llm] strands classify failed: %s", e)
         return None
 
 def classify_intent_llm(query: str) -> str:
     """
     Orchestrates which LLM stack to use based on INTENT_LLM_STACK.
+    Unambiguous keyword matches skip the LLM round-trip entirely.
     Falls back to keywords if anything fails.
     """
+    kw = classify_intent_keywords_unambiguous(query)
+    if kw is not None:
+        logger.debug("[intent-llm] keyword fast path: %s", kw)
+        return kw
     intent = _classify_with_strands(query)
-    print(f"[intent-llm] strands classify: {intent}")
+    logger.debug("[intent-llm] strands classify: %s", intent)
     return intent or classify_intent_keywords(query)
@@ -1,6 +1,14 @@
 from __future__ import annotations
 import json, ast
-from typing import Any, Mapping, Sequence, Dict
+from collections import deque
+from typing import Any, Mapping, Dict
+
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
 
 def unwrap_tool_result(raw: Any) -> Any:
     """
@@ -16,62 +24,64 @@ def unwrap_tool_result(raw: Any) -> Any:
                 if "json" in part and isinstance(part["json"], dict):
                     return part["json"]
                 if "text" in part and isinstance(part["text"], str):
-                    s = part["text"].strip()
+                    # orjson tolerates surrounding whitespace; only strip on fallback
+                    s = part["text"] if orjson is not None else part["text"].strip()
                     try:
-                        return json.loads(s)
-                    except json.JSONDecodeError:
+                        return _json_loads(s)
+                    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
                         try:
-                            return ast.literal_eval(s)
+                            return ast.literal_eval(s.strip())
                         except Exception:
                             return {}
     return raw
 
 def _walk_dicts(obj: Any):
-    """Yield every dict inside obj recursively."""
-    if isinstance(obj, Mapping):
-        yield obj
-        for v in obj.values():
-            yield from _walk_dicts(v)
-    elif isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
-        for v in obj:
-            yield from _walk_dicts(v)
+    """Yield every dict inside obj, depth-first, without recursion."""
+    stack = deque([obj])
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, Mapping):
+            yield cur
+            stack.extend(reversed(list(cur.values())))
+        elif isinstance(cur, (list, tuple)):
+            stack.extend(reversed(cur))
 
 def first_dict_with_keys(obj: Any, required_any=None, required_all=None) -> Dict[str, Any]:
     """Find the first dict having any/all of the required keys."""
-    required_any = set(required_any or [])
-    required_all = set(required_all or [])
+    required_any = required_any or ()
+    required_all = required_all or ()
     for d in _walk_dicts(obj):
-        keys = set(d.keys())
-        if required_all and not required_all.issubset(keys):
+        if required_all and not all(k in d for k in required_all):
             continue
-        if required_any and not (required_any & keys):
+        if required_any and not any(k in d for k in required_any):
             continue
         return dict(d)
     return {}
 
+_EMAIL_KEYS = frozenset({"emailAddress", "emailUid"})
+_ADDRESS_KEYS = frozenset({"addressLineOne", "city", "stateCd", "zipCd", "addressUid"})
+
 def extract_first_email(email_json: Any) -> Dict[str, Any]:
     if isinstance(email_json, Mapping):
         arr = email_json.get("email") or email_json.get("emails")
-        if isinstance(arr, list) and arr:
+        if isinstance(arr, list) and arr and isinstance(arr[0], Mapping):
             return dict(arr[0])
-    return first_dict_with_keys(email_json, required_any={"emailAddress", "emailUid"})
+    return first_dict_with_keys(email_json, required_any=_EMAIL_KEYS)
 
 def extract_first_address(address_json: Any) -> Dict[str, Any]:
     if isinstance(address_json, Mapping):
         arr = address_json.get("address") or address_json.get("addresses")
-        if isinstance(arr, list) and arr:
+        if isinstance(arr, list) and arr and isinstance(arr[0], Mapping):
             return dict(arr[0])
-    return first_dict_with_keys(
-        address_json,
-        required_any={"addressLineOne", "city", "stateCd", "zipCd", "addressUid"},
-    )
+    return first_dict_with_keys(address_json, required_any=_ADDRESS_KEYS)
 
 def extract_preferences_list(preferences_json: Any) -> list:
     """Return a list of preference items from many possible shapes."""
     if not isinstance(preferences_json, Mapping):
         return []
-    if isinstance(preferences_json.get("memberPreference"), list):
-        return list(preferences_json["memberPreference"])
+    member_prefs = preferences_json.get("memberPreference")
+    if isinstance(member_prefs, list):
+        return list(member_prefs)
     prefs = preferences_json.get("preferences")
     if isinstance(prefs, Mapping) and isinstance(prefs.get("memberPreference"), list):
         return list(prefs["memberPreference"])
@@ -20,14 +20,17 @@ os.environ.setdefault("PROFILE_BASIC_AUTH", "")  # ex: "Basic base64(client_id:s
 os.environ.setdefault("DEFAULT_MEMBER_ID", "378477398")
 
 import asyncio
+import atexit
 import json
 import logging
-import threading
+import re
 import time
-from typing import List, Optional, Literal
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Literal, Tuple
 
 import httpx
-from pydantic import BaseModel, Field
+import uvicorn
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from strands import Agent, tool
 from strands.models import BedrockModel
@@ -35,11 +38,48 @@ from strands.multiagent.a2a import A2AServer
 
 from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
 from a2a.types import Message, Part, Role, TextPart
-from uuid import uuid4
+import itertools
+import secrets
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+_json_loads = orjson.loads if orjson is not None else json.loads  # both accept bytes
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("colab-strands")
 
+# One pooled client for the profile APIs and the A2A hop, so TCP/TLS
+# connections are reused across calls. HTTP/2 only when `h2` is installed.
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_HTTP = httpx.AsyncClient(
+    timeout=120,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    http2=_HTTP2,
+)
+
+
+@atexit.register
+def _close_http():
+    try:
+        asyncio.run(_HTTP.aclose())
+    except Exception:
+        pass  # the loop that owned the pooled connections is already gone
+
 # ----------------------------
 # 1) Pydantic models
 # ----------------------------
@@ -82,6 +122,9 @@ class OrchestratorResponse(BaseModel):
     entities: List[EntityKV]
     data: ProfileData
 
+# Built once at import; the reply parser validates and dumps through it
+_ORCH_TA = TypeAdapter(OrchestratorResponse)
+
 # ----------------------------
 # 2) System prompt for intent agent (exact spec)
 # ----------------------------
@@ -124,16 +167,35 @@ PROFILE_API_BASE   = os.getenv("PROFILE_API_BASE", "").rstrip("/")
 PROFILE_API_KEY    = os.getenv("PROFILE_API_KEY", "")
 PROFILE_BASIC_AUTH = os.getenv("PROFILE_BASIC_AUTH", "")
 DEFAULT_MEMBER_ID  = os.getenv("DEFAULT_MEMBER_ID", "378477398")
+PROFILE_CACHE_TTL_S = float(os.getenv("PROFILE_CACHE_TTL_S", "60"))
+PROFILE_CACHE_MAX = 1024
+_MID_RX = re.compile(r"\b(\d{9,12})\b")  # member ids are 9-12 digit numerics
+
+# In-process caches: one token, and an LRU of shaped profiles bounded at
+# PROFILE_CACHE_MAX whose entries are dropped once found expired
+_token_cache: Dict[str, Any] = {"token": None, "exp": 0.0}
+_token_lock = asyncio.Lock()
+_profile_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # member_id -> (expires_at, shaped JSON)
 
 def _use_real_api() -> bool:
     # return bool(PROFILE_API_BASE and PROFILE_API_KEY and PROFILE_BASIC_AUTH)
-    print(f"_use_real_api: False")
     return False
 
 async def _fetch_access_token() -> Optional[str]:
+    if _token_cache["token"] and time.monotonic() < _token_cache["exp"] - 30:
+        return _token_cache["token"]
+    async with _token_lock:  # one refresh at a time; others reuse its result
+        if _token_cache["token"] and time.monotonic() < _token_cache["exp"] - 30:
+            return _token_cache["token"]
+        token, expires_in = await _request_access_token()
+        _token_cache["token"] = token
+        _token_cache["exp"] = time.monotonic() + expires_in
+        return token
+
+async def _request_access_token() -> Tuple[Optional[str], float]:
     if not _use_real_api():
         # mock token
-        return "MOCK_TOKEN"
+        return "MOCK_TOKEN", 900
     url = f"{PROFILE_API_BASE}/v1/oauth/accesstoken"
     headers = {
         "apikey": PROFILE_API_KEY,
@@ -141,17 +203,16 @@ async def _fetch_access_token() -> Optional[str]:
         "Content-Type": "application/x-www-form-urlencoded",
     }
     data = {"grant_type": "client_credentials", "scope": "public"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        # resp = await client.post(url, headers=headers, data=data)
-        # resp.raise_for_status()
-        # js = resp.json()
-        # return js.get("access_token")
-        print(f"_fetch_access_token: MOCK_TOKEN")
-        return "MOCK_TOKEN"
+    # resp = await _HTTP.post(url, headers=headers, data=data, timeout=30)
+    # resp.raise_for_status()
+    # js = _json_loads(resp.content)
+    # return js.get("access_token"), float(js.get("expires_in", 900))
+    logger.debug("_fetch_access_token: MOCK_TOKEN")
+    return "MOCK_TOKEN", 900
 
 async def _fetch_address(member_id: str, bearer: str) -> Optional[dict]:
     if not _use_real_api():
-        print(f"_fetch_address: MOCK_ADDRESS")
+        logger.debug("_fetch_address: MOCK_ADDRESS")
         return {
             "address": [{
                 "addressTypeCd": {"code": "HOME", "name": "Home", "description": "The type of address is In Home."},
@@ -166,14 +227,13 @@ async def _fetch_address(member_id: str, bearer: str) -> Optional[dict]:
         }
     url = f"{PROFILE_API_BASE}/genai/v1/{member_id}/address"
     headers = {"apikey": PROFILE_API_KEY, "Authorization": f"Bearer {bearer}"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _HTTP.get(url, headers=headers, timeout=30)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
 
 async def _fetch_email(member_id: str, bearer: str) -> Optional[dict]:
     if not _use_real_api():
-        print(f"_fetch_email: MOCK_EMAIL")
+        logger.debug("_fetch_email: MOCK_EMAIL")
         return {
             "email": [{
                 "emailTypeCd": {"code": "EMAIL1", "name": "EMAIL 1", "desc": "EMAIL 1"},
@@ -184,50 +244,103 @@ async def _fetch_email(member_id: str, bearer: str) -> Optional[dict]:
         }
     url = f"{PROFILE_API_BASE}/genai/v1/{member_id}/email"
     headers = {"apikey": PROFILE_API_KEY, "Authorization": f"Bearer {bearer}"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _HTTP.get(url, headers=headers, timeout=30)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
+
+def _is_unauthorized(exc: BaseException) -> bool:
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 401
+
+async def _fetch_email_and_address(member_id: str) -> Tuple[Optional[dict], Optional[dict]]:
+    """
+    Fetch email and address concurrently with the token refresh. The fetches
+    start right away with the last known token; if that token was rejected
+    (401) they are resubmitted once with the fresh one.
+    """
+    stale = _token_cache["token"]
+    if not stale:
+        # nothing to speculate with on the first call
+        token = await _fetch_access_token()
+        return await asyncio.gather(_fetch_email(member_id, token or ""), _fetch_address(member_id, token or ""))
+
+    # TaskGroup wraps failures in an ExceptionGroup; callers get the first
+    # exception itself, as they did from asyncio.gather
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_fetch_access_token())
+            t_email = tg.create_task(_fetch_email(member_id, stale))
+            t_addr = tg.create_task(_fetch_address(member_id, stale))
+        return t_email.result(), t_addr.result()
+    except ExceptionGroup as eg:
+        if not all(_is_unauthorized(e) for e in eg.exceptions):
+            raise eg.exceptions[0]
+        if _token_cache["token"] == stale:
+            _token_cache["exp"] = 0.0  # rejected upstream: force a refresh
 
-def _shape_profile_response(member_id: str, email_json: Optional[dict], address_json: Optional[dict]) -> OrchestratorResponse:
+    token = await _fetch_access_token()
+    try:
+        async with asyncio.TaskGroup() as tg:
+            t_email = tg.create_task(_fetch_email(member_id, token or ""))
+            t_addr = tg.create_task(_fetch_address(member_id, token or ""))
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return t_email.result(), t_addr.result()
+
+# Constant part of every profile response; shared, never mutated
+_USER_JOURNEY = {
+    "journey": "MANAGE_PROFILE",
+    "subjourney": "ENSURE_VALID_PROFILE",
+    "task": "CHECK_PROFILE",
+    "subtask": "PROFILE_OVERVIEW",
+}
+
+def _kv(name: str, value: Any) -> Dict[str, Any]:
+    # mirrors model_dump_json(exclude_none=True): no "value" key when it is None
+    return {"name": name} if value is None else {"name": name, "value": value}
+
+_EMPTY: Dict[str, Any] = {}  # shared read-only default for missing code objects
+
+# (label, key, is_code) in output order; code fields hold {"code": ...} objects
+_ADDR_FIELDS = (
+    ("Address Type Cd", "addressTypeCd", True),
+    ("Address Line One: ", "addressLineOne", False),
+    ("Care Of: ", "careOf", False),
+    ("City: ", "city", False),
+    ("StateCd: ", "stateCd", True),
+    ("CountryCd: ", "countryCd", True),
+    ("CountyCd: ", "countyCd", True),
+    ("ZipCd: ", "zipCd", False),
+    ("ZipCdExt: ", "zipCdExt", False),
+)
+
+def _shape_profile_response(member_id: str, email_json: Optional[dict], address_json: Optional[dict]) -> Dict[str, Any]:
+    """
+    Build the OrchestratorResponse-shaped dict directly. Inputs are our own
+    extracted values, so the pydantic models are not constructed per request.
+    """
     # Extract first records if arrays exist
     email_item = (email_json or {}).get("email", [{}])[0] if email_json else {}
     addr_item  = (address_json or {}).get("address", [{}])[0] if address_json else {}
-
-    # Compose final structure
-    data = ProfileData(
-        email=[KVPair(name="Email Address: ", value=email_item.get("emailAddress"))],
-        address=[
-            KVPair(name="Address Type Cd", value=((addr_item.get("addressTypeCd") or {}).get("code"))),
-            KVPair(name="Address Line One: ", value=addr_item.get("addressLineOne")),
-            KVPair(name="Care Of: ", value=addr_item.get("careOf")),
-            KVPair(name="City: ", value=addr_item.get("city")),
-            KVPair(name="StateCd: ", value=((addr_item.get("stateCd") or {}).get("code"))),
-            KVPair(name="CountryCd: ", value=((addr_item.get("countryCd") or {}).get("code"))),
-            KVPair(name="CountyCd: ", value=((addr_item.get("countyCd") or {}).get("code"))),
-            KVPair(name="ZipCd: ", value=addr_item.get("zipCd")),
-            KVPair(name="ZipCdExt: ", value=addr_item.get("zipCdExt")),
+    g = addr_item.get
+
+    return {
+        "user_journey": _USER_JOURNEY,
+        "header": {
+            "title": f"Your profile for {member_id}",
+            "description": "Description Text - Optional field",
+        },
+        "entities": [
+            _kv("emailUid", email_item.get("emailUid")),
+            _kv("addressUid", addr_item.get("addressUid")),
         ],
-    )
-    entities = [
-        EntityKV(name="emailUid", value=email_item.get("emailUid")),
-        EntityKV(name="addressUid", value=addr_item.get("addressUid")),
-    ]
-    resp = OrchestratorResponse(
-        user_journey=UserJourney(
-            journey="MANAGE_PROFILE",
-            subjourney="ENSURE_VALID_PROFILE",
-            task="CHECK_PROFILE",
-            subtask="PROFILE_OVERVIEW",
-        ),
-        header=Header(
-            title=f"Your profile for {member_id}",
-            description="Description Text - Optional field",
-        ),
-        entities=entities,
-        data=data,
-    )
-    return resp
+        "data": {
+            "email": [_kv("Email Address: ", email_item.get("emailAddress"))],
+            "address": [
+                _kv(label, (g(key) or _EMPTY).get("code") if is_code else g(key))
+                for label, key, is_code in _ADDR_FIELDS
+            ],
+        },
+    }
 
 @tool
 async def profile_tool(member_id: str) -> str:
@@ -235,14 +348,25 @@ async def profile_tool(member_id: str) -> str:
     Fetch access token, then fetch email and address for the given member_id, and return the final structured JSON string.
     Returns: JSON string that matches OrchestratorResponse schema.
     """
-    token = await _fetch_access_token()
-    email_json, address_json = await asyncio.gather(
-        _fetch_email(member_id, token or ""),
-        _fetch_address(member_id, token or ""),
-    )
+    if not _MID_RX.fullmatch(member_id):
+        # fail before any token/profile request is made
+        raise ValueError(f"Invalid member_id: {member_id!r}")
+    cached = _profile_cache.get(member_id)
+    if cached:
+        if time.monotonic() < cached[0]:
+            _profile_cache.move_to_end(member_id)
+            return cached[1]
+        del _profile_cache[member_id]
+
+    email_json, address_json = await _fetch_email_and_address(member_id)
     shaped = _shape_profile_response(member_id, email_json, address_json)
     # Return as compact JSON for the agent to emit as-is
-    return shaped.model_dump_json(exclude_none=True)
+    out = _json_dumps(shaped)
+    _profile_cache[member_id] = (time.monotonic() + PROFILE_CACHE_TTL_S, out)
+    _profile_cache.move_to_end(member_id)
+    if len(_profile_cache) > PROFILE_CACHE_MAX:
+        _profile_cache.popitem(last=False)
+    return out
 
 # ----------------------------
 # 4) Profile Agent as A2A server
@@ -261,16 +385,26 @@ profile_agent = Agent(
 )
 
 
-def _run_a2a_server():
+async def _serve_a2a():
+    """Serve the Profile Agent on the current event loop (no extra thread)."""
     server = A2AServer(agent=profile_agent, host="127.0.0.1", port=9000)
-    server.serve()
-
+    config = uvicorn.Config(server.to_starlette_app(), host="127.0.0.1", port=9000, log_level="warning")
+    await uvicorn.Server(config).serve()
 
 
-# Start server in background thread
-server_thread = threading.Thread(target=_run_a2a_server, daemon=True)
-server_thread.start()
-time.sleep(2)  # give server a moment to bind
+async def _wait_until_ready(host: str = "127.0.0.1", port: int = 9000, timeout: float = 5.0):
+    """Poll the A2A port until it accepts TCP connections instead of sleeping a fixed time."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"A2A server at {host}:{port} did not start within {timeout}s")
+            await asyncio.sleep(0.02)
+        else:
+            writer.close()
+            return
 
 
 # ----------------------------
@@ -283,175 +417,276 @@ orchestrator_agent = Agent(
     # model=BedrockModel(model_id="anthropic.claude-sonnet-4-20250514-v1:0"),
 )
 
+# Keyword fast path: a query that matches exactly one intent is answered
+# locally; none or several matches still go to the model.
+_INTENT_PATTERNS = (
+    ("PROFILE_OVERVIEW", re.compile(r"\b(profile|contact|address|email|phone|personal info)\b", re.I)),
+    ("BENEFITS_OVERVIEW", re.compile(r"\b(benefits?|coverage|mri|copay|deductible)\b", re.I)),
+    ("REVIEW_PROVIDERS", re.compile(r"\b(providers?|doctors?|in.network|find a doctor)\b", re.I)),
+)
+def _extract_member_id(user_query: str) -> Optional[str]:
+    m = _MID_RX.search(user_query)
+    return m.group(1) if m else None
+
+def _detect_intent_keywords(user_query: str) -> Optional[IntentEntityView]:
+    hits = [intent for intent, rx in _INTENT_PATTERNS if rx.search(user_query)]
+    if len(hits) != 1:
+        return None
+    return IntentEntityView.model_construct(
+        primary_intent=hits[0],
+        confidence=0.95,
+        member_id=_extract_member_id(user_query),
+    )
+
 async def detect_intent(user_query: str) -> IntentEntityView:
+    fast = _detect_intent_keywords(user_query)
+    if fast is not None:
+        return fast
     # Pass a plain string, and use positional args per Strands examples
     result: IntentEntityView = await orchestrator_agent.structured_output_async(
         IntentEntityView,
         f"{user_query}"
     )
+    # a member id in the query is taken verbatim rather than from the model's JSON
+    member_id = _extract_member_id(user_query)
+    if member_id:
+        result.member_id = member_id
     return result
 
 # ----------------------------
 # 6) A2A client helper
 # ----------------------------
 
+# Message ids only need to be unique within this process: a random prefix
+# plus a counter avoids a urandom read per message.
+_MSGID_PREFIX = secrets.token_hex(4)
+_msgid_counter = itertools.count()
+
 def _create_a2a_message(text: str) -> Message:
     return Message(
         kind="message",
         role=Role.user,
         parts=[Part(TextPart(kind="text", text=text))],
-        message_id=uuid4().hex,
+        message_id=f"{_MSGID_PREFIX}{next(_msgid_counter):08x}",
     )
 
-import json, httpx
-from typing import Any, Dict
+_JSON_DECODER = json.JSONDecoder()
+
+def _parse_profile_json(text: str) -> Dict[str, Any]:
+    """Parse the Profile Agent's reply with pydantic's jiter-backed JSON parser."""
+    try:
+        return _ORCH_TA.dump_python(_ORCH_TA.validate_json(text), exclude_none=True)
+    except ValidationError as ve:
+        # tolerate prose around the JSON object: decode the first object in place,
+        # without a second scan from the end or a substring copy
+        start = text.find("{")
+        if start < 0:
+            raise
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            raise ve from None
+        return _ORCH_TA.dump_python(_ORCH_TA.validate_python(obj), exclude_none=True)
+
+
+def _extract_text_from_parts(parts) -> str:
+    out = []
+    append = out.append
+    for p in parts or ():
+        try:
+            # dict-shaped part: {"kind": "text", "text": ...} or {"value": {"text": ...}}
+            t = p["text"] if p.get("kind") == "text" else p["value"]["text"]
+        except (AttributeError, KeyError, TypeError):
+            # pydantic Part (RootModel) / TextPart objects
+            inner = getattr(p, "root", None) or getattr(p, "value", p)
+            t = getattr(inner, "text", None) or getattr(p, "text", None)
+        if isinstance(t, str):
+            append(t)
+    return "".join(out).strip()
+
+
+def _extract_text_from_message_obj(message) -> str:
+    if isinstance(message, dict):
+        return _extract_text_from_parts(message.get("parts"))
+    return _extract_text_from_parts(getattr(message, "parts", None))
+
+
+def _json_complete(text: str) -> bool:
+    """Cheap check that a streamed reply holds a closed top-level JSON object."""
+    return "{" in text and text.count("{") == text.count("}")
+
+
+# ---- stream event handlers: (event, buffer, state) -> None ----
+# Text that replaces the reply so far goes to state["final"]; deltas go to buffer.
+
+def _on_tuple_event(event, buffer, state):
+    # tuple: (task, update); streamed artifact chunks are aggregated on the Task
+    if len(event) < 2:
+        return
+    artifacts = getattr(event[0], "artifacts", None)
+    if artifacts:
+        t = _extract_text_from_parts(getattr(artifacts[-1], "parts", None))
+        if t:
+            state["final"] = t
+    payload = event[1]
+    if isinstance(payload, dict):
+        if "message" in payload:
+            t = _extract_text_from_message_obj(payload["message"])
+            if t:
+                state["final"] = t
+        elif isinstance(payload.get("text"), str):
+            buffer.append(payload["text"])
+        elif isinstance(payload.get("delta"), dict) and isinstance(payload["delta"].get("text"), str):
+            buffer.append(payload["delta"]["text"])
+    elif isinstance(payload, str):
+        buffer.append(payload)
+
+def _on_message_holder(event, buffer, state):
+    t = _extract_text_from_message_obj(event.message)
+    if t:
+        state["final"] = t
+
+def _on_message(event, buffer, state):
+    t = _extract_text_from_message_obj(event)
+    if t:
+        state["final"] = t
+
+def _on_delta(event, buffer, state):
+    dt = getattr(event.delta, "text", None) or getattr(event, "textDelta", None)
+    if isinstance(dt, str):
+        buffer.append(dt)
+
+def _on_ignored(event, buffer, state):
+    pass
+
+def _pick_event_handler(event):
+    """Same precedence as the original if/elif chain, decided once per event type."""
+    if isinstance(event, tuple):
+        return _on_tuple_event
+    if hasattr(event, "message"):
+        return _on_message_holder
+    if getattr(event, "kind", "") == "message" or event.__class__.__name__ == "Message":
+        return _on_message
+    if hasattr(event, "delta"):
+        return _on_delta
+    return _on_ignored
+
+# The stream emits a handful of event classes, so this settles after the first few events
+_EVENT_HANDLERS: Dict[type, Any] = {}
+
+
+# The agent card does not change while the server runs, and the client only
+# wraps the pooled _HTTP transport, so both are resolved once per base_url.
+_a2a_clients: Dict[str, Any] = {}
+_a2a_client_lock = asyncio.Lock()
+
+async def _get_a2a_client(base_url: str):
+    client = _a2a_clients.get(base_url)
+    if client is not None:
+        return client
+    async with _a2a_client_lock:
+        client = _a2a_clients.get(base_url)
+        if client is None:
+            agent_card = await A2ACardResolver(httpx_client=_HTTP, base_url=base_url).get_agent_card()
+            # Stream events so we can return as soon as a complete JSON object has arrived
+            config = ClientConfig(httpx_client=_HTTP, streaming=True)
+            client = _a2a_clients[base_url] = ClientFactory(config).create(agent_card)
+        return client
+
 
 async def call_profile_agent_via_a2a(member_id: str) -> Dict[str, Any]:
     base_url = "http://127.0.0.1:9000"
 
     # ---------- 1) Try the official client first (works when event shapes are supported) ----------
     try:
-        async with httpx.AsyncClient(timeout=120) as httpx_client:
-            resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
-            agent_card = await resolver.get_agent_card()
-
-            # Try non-streaming first; some builds return a single success envelope
-            config = ClientConfig(httpx_client=httpx_client, streaming=False)
-            client = ClientFactory(config).create(agent_card)
-
-            msg = _create_a2a_message(text=f"member_id={member_id}")
-
-            final_text = None
-            buffer = []
-
-            def _extract_text_from_parts(parts):
-                out = []
-                for p in parts or []:
-                    if isinstance(p, dict):
-                        if p.get("kind") == "text" and isinstance(p.get("text"), str):
-                            out.append(p["text"])
-                        elif isinstance(p.get("value"), dict) and isinstance(p["value"].get("text"), str):
-                            out.append(p["value"]["text"])
-                    else:
-                        inner = getattr(p, "value", p)
-                        t = getattr(inner, "text", None) or getattr(p, "text", None)
-                        if isinstance(t, str):
-                            out.append(t)
-                return "".join(out).strip()
-
-            def _extract_text_from_message_obj(message):
-                if isinstance(message, dict):
-                    return _extract_text_from_parts(message.get("parts", []))
-                return _extract_text_from_parts(getattr(message, "parts", None))
-
-            async for event in client.send_message(msg):
-                # tuple: (etype, payload)
-                if isinstance(event, tuple) and len(event) >= 2:
-                    payload = event[1]
-                    if isinstance(payload, dict):
-                        if "message" in payload:
-                            t = _extract_text_from_message_obj(payload["message"])
-                            if t:
-                                final_text = t
-                        elif isinstance(payload.get("text"), str):
-                            buffer.append(payload["text"])
-                        elif isinstance(payload.get("delta"), dict) and isinstance(payload["delta"].get("text"), str):
-                            buffer.append(payload["delta"]["text"])
-                    elif isinstance(payload, str):
-                        buffer.append(payload)
-
-                elif hasattr(event, "message"):
-                    t = _extract_text_from_message_obj(event.message)
-                    if t:
-                        final_text = t
-
-                elif getattr(event, "kind", "") == "message" or event.__class__.__name__ == "Message":
-                    t = _extract_text_from_message_obj(event)
-                    if t:
-                        final_text = t
-
-                elif hasattr(event, "delta"):
-                    dt = getattr(event.delta, "text", None) or getattr(event, "textDelta", None)
-                    if isinstance(dt, str):
-                        buffer.append(dt)
-
-            if not final_text and buffer:
-                final_text = "".join(buffer).strip()
-
-            if final_text:
+        client = await _get_a2a_client(base_url)
+
+        msg = _create_a2a_message(text=f"member_id={member_id}")
+
+        state = {"final": None}
+        buffer = []
+
+        async for event in client.send_message(msg):
+            handler = _EVENT_HANDLERS.get(type(event))
+            if handler is None:
+                handler = _EVENT_HANDLERS[type(event)] = _pick_event_handler(event)
+            handler(event, buffer, state)
+            final_text = state["final"]
+
+            # parse incrementally: stop reading once the braces balance and the JSON validates
+            candidate = final_text or "".join(buffer)
+            if candidate and _json_complete(candidate):
                 try:
-                    return json.loads(final_text)
-                except json.JSONDecodeError:
-                    s, e = final_text.find("{"), final_text.rfind("}")
-                    if s >= 0 and e >= 0:
-                        return json.loads(final_text[s:e+1])
-                    raise
+                    return _parse_profile_json(candidate)
+                except ValidationError:
+                    pass  # not the whole object yet
+
+        final_text = state["final"]
+        if not final_text and buffer:
+            final_text = "".join(buffer).strip()
+
+        if final_text:
+            return _parse_profile_json(final_text)
 
     except Exception:
-        # swallow and fall through to HTTP fallback
-        pass
+        # swallow and fall through to HTTP fallback; rebuild the client next time
+        # in case the server restarted with a different card
+        _a2a_clients.pop(base_url, None)
 
     # ---------- 2) Fallback: direct HTTP POST to the server (works across client quirks) ----------
-    async with httpx.AsyncClient(timeout=120) as client:
-        # Try simplest "text" body first (server advertises defaultInputModes: ["text"])
-        r = await client.post(base_url + "/", json={"text": f"member_id={member_id}"})
-        r.raise_for_status()
-        js = r.json()
-
-        # Common shapes to extract the response text
+    # Try simplest "text" body first (server advertises defaultInputModes: ["text"])
+    r = await _HTTP.post(base_url + "/", json={"text": f"member_id={member_id}"})
+    r.raise_for_status()
+    js = _json_loads(r.content)
+
+    # Common shapes to extract the response text
+    text = None
+    if isinstance(js, dict):
+        # { "text": "...json..." }
+        if isinstance(js.get("text"), str):
+            text = js["text"].strip()
+
+        # { "message": { "parts": [ { "kind": "text", "text": "...json..." } ] } }
+        if not text and isinstance(js.get("message"), dict):
+            parts = js["message"].get("parts") or []
+            for p in parts:
+                if isinstance(p, dict) and p.get("kind") == "text" and isinstance(p.get("text"), str):
+                    text = p["text"].strip()
+                    break
+
+        # { "parts": [ { "kind": "text", "text": "...json..." } ] }
+        if not text and isinstance(js.get("parts"), list):
+            for p in js["parts"]:
+                if isinstance(p, dict) and p.get("kind") == "text" and isinstance(p.get("text"), str):
+                    text = p["text"].strip()
+                    break
+
+    if not text or not text.strip():
+        # Try a more explicit message envelope if the first shot didn't work
+        payload = {
+            "message": {
+                "kind": "message",
+                "role": "user",
+                "parts": [{"kind": "text", "text": f"member_id={member_id}"}],
+            }
+        }
+        r2 = await _HTTP.post(base_url + "/", json=payload)
+        r2.raise_for_status()
+        js2 = _json_loads(r2.content)
         text = None
-        if isinstance(js, dict):
-            # { "text": "...json..." }
-            if isinstance(js.get("text"), str):
-                text = js["text"].strip()
-
-            # { "message": { "parts": [ { "kind": "text", "text": "...json..." } ] } }
-            if not text and isinstance(js.get("message"), dict):
-                parts = js["message"].get("parts") or []
-                for p in parts:
+        if isinstance(js2, dict):
+            if isinstance(js2.get("message"), dict):
+                for p in js2["message"].get("parts", []):
                     if isinstance(p, dict) and p.get("kind") == "text" and isinstance(p.get("text"), str):
                         text = p["text"].strip()
                         break
+            if not text and isinstance(js2.get("text"), str):
+                text = js2["text"].strip()
 
-            # { "parts": [ { "kind": "text", "text": "...json..." } ] }
-            if not text and isinstance(js.get("parts"), list):
-                for p in js["parts"]:
-                    if isinstance(p, dict) and p.get("kind") == "text" and isinstance(p.get("text"), str):
-                        text = p["text"].strip()
-                        break
+    if not text:
+        raise RuntimeError("Empty response from Profile Agent (HTTP fallback)")
 
-        if not text or not text.strip():
-            # Try a more explicit message envelope if the first shot didn't work
-            payload = {
-                "message": {
-                    "kind": "message",
-                    "role": "user",
-                    "parts": [{"kind": "text", "text": f"member_id={member_id}"}],
-                }
-            }
-            r2 = await client.post(base_url + "/", json=payload)
-            r2.raise_for_status()
-            js2 = r2.json()
-            text = None
-            if isinstance(js2, dict):
-                if isinstance(js2.get("message"), dict):
-                    for p in js2["message"].get("parts", []):
-                        if isinstance(p, dict) and p.get("kind") == "text" and isinstance(p.get("text"), str):
-                            text = p["text"].strip()
-                            break
-                if not text and isinstance(js2.get("text"), str):
-                    text = js2["text"].strip()
-
-        if not text:
-            raise RuntimeError("Empty response from Profile Agent (HTTP fallback)")
-
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            s, e = text.find("{"), text.rfind("}")
-            if s >= 0 and e >= 0:
-                return json.loads(text[s:e+1])
-            raise
+    return _parse_profile_json(text)
 
 
 
@@ -461,16 +696,22 @@ async def call_profile_agent_via_a2a(member_id: str) -> Dict[str, Any]:
 # ----------------------------
 
 async def run_demo(user_query: str):
-    intent = await detect_intent(user_query)
-    print("Intent detection:", intent.model_dump())
-
-    if intent.primary_intent == "PROFILE_OVERVIEW":
-        member_id = intent.member_id or DEFAULT_MEMBER_ID
-        result = await call_profile_agent_via_a2a(member_id)
-        print("\nFinal Structured Output response:")
-        print(json.dumps(result, indent=2))
-    else:
-        print("Primary Intent:", intent.primary_intent)
+    server_task = asyncio.create_task(_serve_a2a())
+    try:
+        await _wait_until_ready()
+
+        intent = await detect_intent(user_query)
+        print("Intent detection:", intent.model_dump())
+
+        if intent.primary_intent == "PROFILE_OVERVIEW":
+            member_id = intent.member_id or DEFAULT_MEMBER_ID
+            result = await call_profile_agent_via_a2a(member_id)
+            print("\nFinal Structured Output response:")
+            print(_json_dumps(result, indent=True))
+        else:
+            print("Primary Intent:", intent.primary_intent)
+    finally:
+        server_task.cancel()
 
 # Run the flow with your sample query
 if __name__ == "__main__":
@@ -5,33 +5,68 @@
 import os
 import json
 import asyncio
+import atexit
 import logging
+import re
+import socket
 import threading
 import time
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
 
 from dotenv import load_dotenv
 load_dotenv()
 
-# Colab-friendly event loop handling
+# Colab-friendly event loop handling: notebooks already run a loop, and only
+# then is nest_asyncio's patching needed
 try:
-    import nest_asyncio  # type: ignore
-    nest_asyncio.apply()
-except Exception:
-    pass
+    asyncio.get_running_loop()
+    _LOOP_ALREADY_RUNNING = True
+except RuntimeError:
+    _LOOP_ALREADY_RUNNING = False
+
+if _LOOP_ALREADY_RUNNING:
+    try:
+        import nest_asyncio  # type: ignore
+        nest_asyncio.apply()
+    except Exception:
+        pass
+else:
+    # Plain python: use uvloop when installed. nest_asyncio cannot patch
+    # uvloop loops, so the two are mutually exclusive.
+    try:
+        import uvloop  # type: ignore
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 # --- Strands imports (as per docs) --------------------------------------------
 # Structured output + agents
 from pydantic import BaseModel, Field
 from strands import Agent, tool
+from strands.models import BedrockModel
 
 # A2A server + client (matching Strands docs)
 from strands.multiagent.a2a import A2AServer
-import asyncio, httpx, json
 from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
-from a2a.types import Message, Part, Role, TextPart
-from a2a.client.card_resolver import A2ACardResolver
-import httpx
+from a2a.types import AgentExtension, Message, Part, Role, TextPart
+
+# Optional C-accelerated JSON; stdlib json is the fallback
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()  # compact, UTF-8 (no ASCII escaping)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # ------------------------------------------------------------------------------
 # Logging
@@ -45,6 +80,11 @@ logger = logging.getLogger("profile-demo")
 A2A_HOST = os.getenv("A2A_HOST", "127.0.0.1")
 A2A_PORT = int(os.getenv("A2A_PORT", "9000"))
 A2A_BASE_URL = f"http://{A2A_HOST}:{A2A_PORT}"
+# By default the Profile Agent is mounted in-process and called through
+# httpx.ASGITransport: no socket hop, but the transport buffers the whole
+# response, so streamed A2A replies arrive in one piece. Set A2A_SERVE_TCP=true
+# to serve it over TCP (reachable from other processes, and streaming works).
+A2A_SERVE_TCP = os.getenv("A2A_SERVE_TCP", "false").lower() == "true"
 
 # Toggle real API vs mock sample payloads
 PROFILE_USE_REAL_API = os.getenv("PROFILE_USE_REAL_API", "false").lower() == "true"
@@ -56,6 +96,94 @@ UAT_BASIC_AUTH = os.getenv("PROFILE_BASIC_AUTH", "tbd")  # base64 or 'Basic xxxx
 
 DEFAULT_MEMBER_ID = os.getenv("DEFAULT_MEMBER_ID", "378477398")
 
+# Intent model. Latency-optimized inference is only offered for some
+# model/region pairs (e.g. Claude 3.5 Haiku in us-east-2), so it is opt-in.
+INTENT_MODEL_ID = os.getenv("INTENT_MODEL_ID", "")  # ex: "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+INTENT_MODEL_REGION = os.getenv("INTENT_MODEL_REGION", "")  # ex: "us-east-2"
+INTENT_LATENCY_OPTIMIZED = os.getenv("INTENT_LATENCY_OPTIMIZED", "false").lower() == "true"
+
+# Latency advertised on the Profile Agent's card, and the candidate Profile
+# Agents the orchestrator may route to (comma-separated base URLs)
+LATENCY_EXTENSION_URI = "urn:profile-demo:a2a:latency:v1"
+PROFILE_AGENT_P50_MS = float(os.getenv("PROFILE_AGENT_P50_MS", "400"))
+PROFILE_AGENT_P95_MS = float(os.getenv("PROFILE_AGENT_P95_MS", "900"))
+PROFILE_AGENT_URLS = [u.strip() for u in os.getenv("PROFILE_AGENT_URLS", A2A_BASE_URL).split(",") if u.strip()]
+
+
+# Opt-in blocking-call monitor: log any loop step that runs longer than this (e.g. 10)
+ASYNCIO_BLOCKING_MS = float(os.getenv("ASYNCIO_BLOCKING_MS", "0"))
+
+
+def _monitor_blocking_calls() -> None:
+    """Let asyncio's debug mode warn about callbacks that hold the running loop too long."""
+    if ASYNCIO_BLOCKING_MS > 0:
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = ASYNCIO_BLOCKING_MS / 1000
+
+
+# ------------------------------------------------------------------------------
+# Shared HTTP client
+# ------------------------------------------------------------------------------
+# An AsyncClient's pooled connections belong to the loop that opened them, so
+# one long-lived client is kept per running loop (the TCP A2A server runs its
+# own loop in a background thread). HTTP/2 only when `h2` is installed.
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# (loop, in-process base_url or None) -> client; entries for loops that have
+# since closed (each asyncio.run makes a new one) are dropped, see _prune_closed_loops
+_HTTPX: Dict[tuple, httpx.AsyncClient] = {}
+# base_url -> ASGI app of an A2A server mounted in this process
+_IN_PROCESS_APPS: Dict[str, Any] = {}
+
+
+def _prune_closed_loops() -> None:
+    """Forget clients whose loop is closed.
+
+    Their pooled connections belonged to that loop, so they can no longer be
+    closed gracefully; dropping them releases the sockets (and the dead loop)
+    to GC, and keeps them away from the atexit hook.
+    """
+    for key in [k for k in _HTTPX if k[0].is_closed()]:
+        del _HTTPX[key]
+
+
+def get_client(base_url: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Pooled client for the running loop. For a base_url whose A2A app is mounted
+    in-process, requests go straight to the app through an ASGI transport.
+    """
+    app = _IN_PROCESS_APPS.get(base_url) if base_url else None
+    key = (asyncio.get_running_loop(), base_url if app is not None else None)
+    client = _HTTPX.get(key)
+    if client is None:
+        _prune_closed_loops()
+        if app is not None:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=base_url, timeout=300)
+        else:
+            client = httpx.AsyncClient(
+                http2=_HTTP2,
+                # A2A calls wait on an LLM turn; the profile API calls pass timeout=30 themselves
+                timeout=300,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        _HTTPX[key] = client
+    return client
+
+
+@atexit.register
+def _close_clients():
+    _prune_closed_loops()
+    for client in _HTTPX.values():
+        try:
+            asyncio.run(client.aclose())
+        except Exception:
+            pass  # the loop that owned the pooled connections is already gone
+
 
 # ------------------------------------------------------------------------------
 # 1) Orchestrator: Structured Output (as per docs: pass prompt string)
@@ -111,13 +239,60 @@ def new_orchestrator_agent() -> Agent:
     Docs: https://strandsagents.com/.../model-providers/amazon-bedrock/
     """
     return Agent(
+        model=_intent_model(),
         name="Orchestrator Agent",
         description="Detects intent and delegates via A2A",
         system_prompt=SYSTEM_PROMPT_INTENT,
     )
 
 
+@lru_cache(maxsize=1)
+def _intent_model() -> Optional[BedrockModel]:
+    """Configured intent model, built once and shared by every orchestrator Agent.
+
+    The model holds no conversation state, so concurrent detections can share
+    it while each gets its own Agent (and history). None means Strands' default.
+    """
+    if not (INTENT_MODEL_ID or INTENT_LATENCY_OPTIMIZED):
+        return None
+    model_config: Dict[str, Any] = {"streaming": True}
+    if INTENT_MODEL_ID:
+        model_config["model_id"] = INTENT_MODEL_ID
+    if INTENT_MODEL_REGION:
+        model_config["region_name"] = INTENT_MODEL_REGION
+    if INTENT_LATENCY_OPTIMIZED:
+        # top-level Converse field, passed through as-is
+        model_config["additional_args"] = {"performanceConfig": {"latency": "optimized"}}
+    return BedrockModel(**model_config)
+
+
+# Deterministic pre-classifier: when exactly one rule fires, the LLM is skipped
+_PATTERNS = [
+    (re.compile(r"\b(contact details?|address|email|phone|profile|personal info)\b", re.I), "PROFILE_OVERVIEW"),
+    (re.compile(r"\b(benefits?|coverage|copay|deductible)\b", re.I), "BENEFITS_OVERVIEW"),
+    (re.compile(r"\b(providers?|doctors?|find a doctor)\b", re.I), "REVIEW_PROVIDERS"),
+]
+_MID = re.compile(r"\b(\d{6,12})\b")
+
+
+def _classify_by_rules(user_query: str) -> Optional[IntentEntityView]:
+    hits = {intent for rx, intent in _PATTERNS if rx.search(user_query)}
+    if len(hits) != 1:
+        return None
+    m = _MID.search(user_query)
+    return IntentEntityView(
+        primary_intent=hits.pop(),
+        confidence=0.99,
+        member_id=m.group(1) if m else None,
+    )
+
+
 async def detect_intent(user_query: str) -> IntentEntityView:
+    matched = _classify_by_rules(user_query)
+    if matched is not None:
+        return matched
+    # Agent per call: its history is per detection, so overlapping calls can't
+    # clear or pollute each other's messages
     orchestrator = new_orchestrator_agent()
     # Per docs: prompt is a string; system prompt set on agent
     result = await orchestrator.structured_output_async(
@@ -158,7 +333,7 @@ def _mock_address_json() -> Dict[str, Any]:
     }
 
 
-async def _fetch_access_token_async(client: httpx.AsyncClient) -> str:
+async def _fetch_access_token_async(client: httpx.AsyncClient) -> Tuple[str, float]:
     url = f"{UAT_BASE}/v1/oauth/accesstoken"
     headers = {
         "apikey": UAT_APIKEY,
@@ -168,65 +343,148 @@ async def _fetch_access_token_async(client: httpx.AsyncClient) -> str:
     data = {"grant_type": "client_credentials", "scope": "public"}
     resp = await client.post(url, headers=headers, data=data, timeout=30)
     resp.raise_for_status()
-    payload = resp.json()
-    return payload.get("access_token", "")
+    payload = _json_loads(resp.content)
+    return payload.get("access_token", ""), float(payload.get("expires_in", 3600))
+
+
+# Access tokens are reused until shortly before they expire (or are rejected with 401)
+_TOKENS: Dict[tuple, Dict[str, Any]] = {}  # (UAT_BASE, UAT_APIKEY) -> {"value", "exp"}
+# asyncio locks are bound to one loop and the token cache is reached from the
+# caller's loop (in-process mount) as well as the TCP server's, so one per loop
+_TOKEN_LOCKS: Dict[Any, asyncio.Lock] = {}
+
+
+def _token_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _TOKEN_LOCKS.get(loop)
+    if lock is None:
+        # as with _HTTPX, don't keep loops from earlier asyncio.run calls alive
+        for closed in [lp for lp in _TOKEN_LOCKS if lp.is_closed()]:
+            del _TOKEN_LOCKS[closed]
+        lock = _TOKEN_LOCKS[loop] = asyncio.Lock()
+    return lock
+
+
+async def _get_token(client: httpx.AsyncClient) -> str:
+    key = (UAT_BASE, UAT_APIKEY)
+    cached = _TOKENS.get(key)
+    if cached and time.monotonic() < cached["exp"]:
+        return cached["value"]
+    async with _token_lock():
+        cached = _TOKENS.get(key)
+        if cached and time.monotonic() < cached["exp"]:
+            return cached["value"]
+        token, expires_in = await _fetch_access_token_async(client)
+        _TOKENS[key] = {"value": token, "exp": time.monotonic() + expires_in - 30}
+        return token
+
+
+def _invalidate_token() -> None:
+    _TOKENS.pop((UAT_BASE, UAT_APIKEY), None)
+
+
+@lru_cache(maxsize=8)
+def _bearer_headers(token: str) -> Dict[str, str]:
+    """Headers for the profile GETs; built once per token and shared read-only."""
+    return {"apikey": UAT_APIKEY, "Authorization": f"Bearer {token}"}
 
 
 async def _fetch_email_async(client: httpx.AsyncClient, token: str, member_id: str) -> Dict[str, Any]:
     url = f"{UAT_BASE}/genai/v1/{member_id}/email"
-    headers = {"apikey": UAT_APIKEY, "Authorization": f"Bearer {token}"}
-    resp = await client.get(url, headers=headers, timeout=30)
+    resp = await client.get(url, headers=_bearer_headers(token), timeout=30)
     resp.raise_for_status()
-    return resp.json()
+    return _json_loads(resp.content)
 
 
 async def _fetch_address_async(client: httpx.AsyncClient, token: str, member_id: str) -> Dict[str, Any]:
     url = f"{UAT_BASE}/genai/v1/{member_id}/address"
-    headers = {"apikey": UAT_APIKEY, "Authorization": f"Bearer {token}"}
-    resp = await client.get(url, headers=headers, timeout=30)
+    resp = await client.get(url, headers=_bearer_headers(token), timeout=30)
     resp.raise_for_status()
-    return resp.json()
+    return _json_loads(resp.content)
+
 
+async def _fetch_email_and_address(client: httpx.AsyncClient, member_id: str):
+    token = await _get_token(client)
+    # email and address only depend on the token -> fetch them concurrently
+    return await asyncio.gather(
+        _fetch_email_async(client, token, member_id),
+        _fetch_address_async(client, token, member_id),
+    )
 
-def _normalize_profile_payload(member_id: str, email_json: Optional[Dict[str, Any]], address_json: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-    email_obj = (email_json or {}).get("email", [{}])
-    email = email_obj[0] if email_obj else {}
-    addr_obj = (address_json or {}).get("address", [{}])
-    addr = addr_obj[0] if addr_obj else {}
 
-    final: Dict[str, Any] = {
-        "user_journey": {
-            "journey": "MANAGE_PROFILE",
-            "subjourney": "ENSURE_VALID_PROFILE",
-            "task": "CHECK_PROFILE",
-            "subtask": "PROFILE_OVERVIEW",
-        },
-        "header": {
-            "title": f"Your profile for {member_id}",
-            "description": "Description Text - Optional field",
-        },
+# Constant parts of the normalized payload; shared between results (they are
+# only serialized, never mutated)
+_USER_JOURNEY = {
+    "journey": "MANAGE_PROFILE",
+    "subjourney": "ENSURE_VALID_PROFILE",
+    "task": "CHECK_PROFILE",
+    "subtask": "PROFILE_OVERVIEW",
+}
+_HEADER_DESCRIPTION = "Description Text - Optional field"
+_EMPTY: Dict[str, Any] = {}
+
+# (label, key, is_code) in output order; code fields hold {"code": ...} objects
+_ADDRESS_FIELDS = (
+    ("Address Type Cd", "addressTypeCd", True),
+    ("Address Line One: ", "addressLineOne", False),
+    ("Care Of: ", "careOf", False),
+    ("City: ", "city", False),
+    ("StateCd: ", "stateCd", True),
+    ("CountryCd: ", "countryCd", True),
+    ("CountyCd: ", "countyCd", True),
+    ("ZipCd: ", "zipCd", False),
+    ("ZipCdExt: ", "zipCdExt", False),
+)
+
+
+def _profile_values(member_id: str, email_json: Optional[Dict[str, Any]], address_json: Optional[Dict[str, Any]]) -> List[Any]:
+    """The per-request values of the normalized payload, in document order."""
+    email_obj = (email_json or _EMPTY).get("email")
+    email = email_obj[0] if email_obj else _EMPTY
+    addr_obj = (address_json or _EMPTY).get("address")
+    addr = addr_obj[0] if addr_obj else _EMPTY
+    g = addr.get
+    return [
+        f"Your profile for {member_id}",
+        email.get("emailUid"),
+        addr.get("addressUid"),
+        email.get("emailAddress"),
+        *[(g(key) or _EMPTY).get("code") if is_code else g(key) for _, key, is_code in _ADDRESS_FIELDS],
+    ]
+
+
+def _profile_payload(values: List[Any]) -> Dict[str, Any]:
+    """Shape of the normalized payload around the values from _profile_values."""
+    title, email_uid, address_uid, email_address, *address_values = values
+    return {
+        "user_journey": _USER_JOURNEY,
+        "header": {"title": title, "description": _HEADER_DESCRIPTION},
         "entities": [
-            {"name": "emailUid", "value": email.get("emailUid")},
-            {"name": "addressUid", "value": addr.get("addressUid")},
+            {"name": "emailUid", "value": email_uid},
+            {"name": "addressUid", "value": address_uid},
         ],
         "data": {
-            "email": [
-                {"name": "Email Address: ", "value": email.get("emailAddress")},
-            ],
+            "email": [{"name": "Email Address: ", "value": email_address}],
             "address": [
-                {"name": "Address Type Cd", "value": (addr.get("addressTypeCd") or {}).get("code")},
-                {"name": "Address Line One: ", "value": addr.get("addressLineOne")},
-                {"name": "Care Of: ", "value": addr.get("careOf")},
-                {"name": "City: ", "value": addr.get("city")},
-                {"name": "StateCd: ", "value": (addr.get("stateCd") or {}).get("code")},
-                {"name": "CountryCd: ", "value": (addr.get("countryCd") or {}).get("code")},
-                {"name": "CountyCd: ", "value": (addr.get("countyCd") or {}).get("code")},
-                {"name": "ZipCd: ", "value": addr.get("zipCd")},
-                {"name": "ZipCdExt: ", "value": addr.get("zipCdExt")},
-            ]
-        }
+                {"name": label, "value": v} for (label, _, _), v in zip(_ADDRESS_FIELDS, address_values)
+            ],
+        },
     }
-    return final
+
+
+# The payload's structure is fixed, so its JSON is rendered once with
+# placeholder slots and split into the constant fragments between them.
+_SLOT = "\x00slot\x00"
+_PROFILE_FRAGMENTS = _json_dumps(_profile_payload([_SLOT] * (4 + len(_ADDRESS_FIELDS)))).split(_json_dumps(_SLOT))
+
+
+def _render_profile_json(member_id: str, email_json: Optional[Dict[str, Any]], address_json: Optional[Dict[str, Any]]) -> str:
+    """Final JSON string for profile_tool, without building the intermediate dict tree."""
+    out = [_PROFILE_FRAGMENTS[0]]
+    for value, fragment in zip(_profile_values(member_id, email_json, address_json), _PROFILE_FRAGMENTS[1:]):
+        out.append(_json_dumps(value))
+        out.append(fragment)
+    return "".join(out)
 
 
 PROFILE_AGENT_SYSTEM = """
@@ -252,15 +510,18 @@ async def profile_tool(member_id: str) -> str:
     if not PROFILE_USE_REAL_API:
         email_json = _mock_email_json()
         address_json = _mock_address_json()
-        final = _normalize_profile_payload(member_id, email_json, address_json)
-        return json.dumps(final, separators=(",", ":"), ensure_ascii=False)
+        return _render_profile_json(member_id, email_json, address_json)
 
-    async with httpx.AsyncClient() as client:
-        token = await _fetch_access_token_async(client)
-        email_json = await _fetch_email_async(client, token, member_id)
-        address_json = await _fetch_address_async(client, token, member_id)
-        final = _normalize_profile_payload(member_id, email_json, address_json)
-        return json.dumps(final, separators=(",", ":"), ensure_ascii=False)
+    client = get_client()
+    try:
+        email_json, address_json = await _fetch_email_and_address(client, member_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 401:
+            raise
+        # cached token was revoked early: fetch a fresh one and retry once
+        _invalidate_token()
+        email_json, address_json = await _fetch_email_and_address(client, member_id)
+    return _render_profile_json(member_id, email_json, address_json)
 
 
 def make_profile_agent() -> Agent:
@@ -273,42 +534,174 @@ def make_profile_agent() -> Agent:
     )
 
 
-def start_a2a_server_in_background(agent: Agent, host: str = A2A_HOST, port: int = A2A_PORT) -> threading.Thread:
+def _make_a2a_server(agent: Agent, host: str, port: int) -> A2AServer:
     server = A2AServer(agent=agent, host=host, port=port)
+    # advertise expected latency so orchestrators can pick the fastest agent
+    server.capabilities.extensions = [
+        AgentExtension(
+            uri=LATENCY_EXTENSION_URI,
+            description="Declared response latency in milliseconds",
+            params={"p50_ms": PROFILE_AGENT_P50_MS, "p95_ms": PROFILE_AGENT_P95_MS},
+        )
+    ]
+    return server
+
+
+def mount_a2a_in_process(agent: Agent, host: str = A2A_HOST, port: int = A2A_PORT) -> None:
+    """
+    Serve the agent's A2A app inside this process: calls to its base URL become
+    in-memory ASGI calls on the caller's loop, with no socket or extra thread.
+    """
+    server = _make_a2a_server(agent, host, port)
+    _IN_PROCESS_APPS[f"http://{host}:{port}"] = server.to_starlette_app()
+
+
+def start_a2a_server_in_background(agent: Agent, host: str = A2A_HOST, port: int = A2A_PORT) -> threading.Thread:
+    server = _make_a2a_server(agent, host, port)
     t = threading.Thread(target=server.serve, daemon=True)
     t.start()
-    # Give uvicorn time to bind the port
-    time.sleep(1.5)
+    _wait_until_listening(host, port)
     return t
 
 
+def _wait_until_listening(host: str, port: int, timeout: float = 10.0) -> None:
+    """Block until uvicorn accepts connections, instead of sleeping a fixed time."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=0.05).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"A2A server at {host}:{port} did not start within {timeout}s")
+            time.sleep(0.05)
+
+
 # ------------------------------------------------------------------------------
 # 3) A2A client (sync, as per docs)
 #    https://strandsagents.com/.../agent-to-agent/  (Synchronous Client)
 # ------------------------------------------------------------------------------
 
+PROFILE_CACHE_TTL_S = float(os.getenv("PROFILE_CACHE_TTL_S", "60"))
+PROFILE_CACHE_MAX = 1024
+# (member_id, base_url) -> (expires_at, parsed reply); insertion-ordered, oldest evicted first
+_PROFILE_CACHE: Dict[tuple, tuple] = {}
+
+
 async def call_profile_agent(member_id: str, base_url="http://127.0.0.1:9000"):
-    async with httpx.AsyncClient(timeout=300) as httpx_client:
-        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
-        agent_card = await resolver.get_agent_card()
-        client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=False)).create(agent_card)
+    """A2A profile lookup with a short in-process TTL cache per member."""
+    key = (member_id, base_url)
+    hit = _PROFILE_CACHE.get(key)
+    if hit and time.monotonic() < hit[0]:
+        return hit[1]
+    result = await _call_profile_agent_uncached(member_id, base_url)
+    _PROFILE_CACHE.pop(key, None)
+    if len(_PROFILE_CACHE) >= PROFILE_CACHE_MAX:
+        _PROFILE_CACHE.pop(next(iter(_PROFILE_CACHE)))
+    _PROFILE_CACHE[key] = (time.monotonic() + PROFILE_CACHE_TTL_S, result)
+    return result
+
+
+def invalidate_profile_cache(member_id: Optional[str] = None) -> None:
+    """Drop cached replies for one member (e.g. after a profile update), or all of them."""
+    if member_id is None:
+        _PROFILE_CACHE.clear()
+        return
+    for key in [k for k in _PROFILE_CACHE if k[0] == member_id]:
+        del _PROFILE_CACHE[key]
 
-        msg = Message(kind="message", role=Role.user, parts=[Part(TextPart(kind="text", text=f"member_id={member_id}"))])
 
-        async for event in client.send_message(msg):
-            if isinstance(event, Message):
-                text = "".join(
-                    [(getattr(p, "text", None) or getattr(getattr(p, "value", None), "text", "")) for p in (event.parts or [])]
-                ).strip()
-                return json.loads(text)
-            elif isinstance(event, tuple) and len(event) == 2 and getattr(event[1], "message", None):
-                m = event[1].message
-                text = "".join(
-                    [(getattr(p, "text", None) or getattr(getattr(p, "value", None), "text", "")) for p in (m.parts or [])]
-                ).strip()
-                return json.loads(text)
+# (httpx client, base_url) -> (A2A client, agent card). The card rarely changes, so it is
+# resolved once and only re-resolved after a call through the cached client fails.
+_A2A_CLIENTS: Dict[tuple, Any] = {}
 
-        raise RuntimeError("No final Message received")
+
+async def _get_a2a_client(httpx_client: httpx.AsyncClient, base_url: str):
+    return (await _get_a2a_entry(httpx_client, base_url))[0]
+
+
+async def _get_a2a_entry(httpx_client: httpx.AsyncClient, base_url: str):
+    """(client, agent_card) for base_url, resolved on first use."""
+    key = (httpx_client, base_url)
+    entry = _A2A_CLIENTS.get(key)
+    if entry is None:
+        agent_card = await A2ACardResolver(httpx_client=httpx_client, base_url=base_url).get_agent_card()
+        client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=True)).create(agent_card)
+        entry = _A2A_CLIENTS[key] = (client, agent_card)
+    return entry
+
+
+def _declared_p95_ms(agent_card) -> float:
+    """p95 from the card's latency extension; agents that declare nothing sort last."""
+    capabilities = getattr(agent_card, "capabilities", None)
+    for ext in getattr(capabilities, "extensions", None) or []:
+        if ext.uri == LATENCY_EXTENSION_URI and ext.params:
+            return float(ext.params.get("p95_ms", float("inf")))
+    return float("inf")
+
+
+async def pick_profile_agent(base_urls: List[str]) -> str:
+    """Return the reachable candidate with the lowest declared p95 latency."""
+    if len(base_urls) == 1:
+        return base_urls[0]
+    entries = await asyncio.gather(
+        *(_get_a2a_entry(get_client(u), u) for u in base_urls), return_exceptions=True
+    )
+    ranked = sorted(
+        (_declared_p95_ms(e[1]), u) for u, e in zip(base_urls, entries) if not isinstance(e, BaseException)
+    )
+    if not ranked:
+        raise RuntimeError(f"No Profile Agent reachable at {base_urls}")
+    logger.info("Routing profile lookup to %s (declared p95 %.0f ms)", ranked[0][1], ranked[0][0])
+    return ranked[0][1]
+
+
+async def _call_profile_agent_uncached(member_id: str, base_url: str):
+    httpx_client = get_client(base_url)
+    try:
+        return await _send_profile_request(await _get_a2a_client(httpx_client, base_url), member_id)
+    except Exception:
+        # stale card (server restarted/changed): resolve again on the next call
+        _A2A_CLIENTS.pop((httpx_client, base_url), None)
+        raise
+
+
+def _part_text(p) -> str:
+    """Text of an A2A part; the direct attribute is checked first, the wrapped value second."""
+    t = getattr(p, "text", None)
+    if t is not None:
+        return t
+    v = getattr(p, "root", None) or getattr(p, "value", None)  # Part is a RootModel around TextPart
+    return getattr(v, "text", "") if v is not None else ""
+
+
+def _json_complete(text: str) -> bool:
+    """Cheap check that streamed text holds a closed top-level JSON object."""
+    return text.startswith("{") and text.count("{") == text.count("}")
+
+
+async def _send_profile_request(client, member_id: str):
+    msg = Message(kind="message", role=Role.user, parts=[Part(TextPart(kind="text", text=f"member_id={member_id}"))])
+
+    async for event in client.send_message(msg):
+        match event:
+            case Message(parts=parts):
+                return _json_loads("".join(_part_text(p) for p in (parts or ())).strip())
+            case (task, update):
+                m = getattr(update, "message", None)
+                if m is not None:
+                    return _json_loads("".join(_part_text(p) for p in (m.parts or ())).strip())
+                # streamed artifact chunks are accumulated on the task
+                artifacts = getattr(task, "artifacts", None)
+                if artifacts:
+                    text = "".join(_part_text(p) for p in (artifacts[-1].parts or ())).strip()
+                    if _json_complete(text):
+                        try:
+                            return _json_loads(text)
+                        except ValueError:
+                            pass  # braces balanced inside a string; keep reading
+
+    raise RuntimeError("No final Message received")
 
 
 # ------------------------------------------------------------------------------
@@ -316,6 +709,7 @@ async def call_profile_agent(member_id: str, base_url="http://127.0.0.1:9000"):
 # ------------------------------------------------------------------------------
 
 async def run_demo(user_query: str) -> Dict[str, Any]:
+    _monitor_blocking_calls()
     # Intent detection
     print("\nTool #1: IntentEntityView")
     intent = await detect_intent(user_query)
@@ -325,8 +719,9 @@ async def run_demo(user_query: str) -> Dict[str, Any]:
         return {"primary_intent": intent.primary_intent, "note": "No profile lookup performed."}
 
     member_id = intent.member_id or DEFAULT_MEMBER_ID
-    # Call Profile Agent via A2A
-    result = await call_profile_agent(member_id)
+    # Call the fastest available Profile Agent via A2A
+    base_url = await pick_profile_agent(PROFILE_AGENT_URLS)
+    result = await call_profile_agent(member_id, base_url)
     return result
 
 
@@ -335,9 +730,13 @@ async def run_demo(user_query: str) -> Dict[str, Any]:
 # ------------------------------------------------------------------------------
 
 def main():
-    # Start Profile Agent server
+    # Start Profile Agent server: in-process by default, over TCP when other
+    # processes need to reach it
     profile_agent = make_profile_agent()
-    _ = start_a2a_server_in_background(profile_agent, host=A2A_HOST, port=A2A_PORT)
+    if A2A_SERVE_TCP:
+        _ = start_a2a_server_in_background(profile_agent, host=A2A_HOST, port=A2A_PORT)
+    else:
+        mount_a2a_in_process(profile_agent, host=A2A_HOST, port=A2A_PORT)
 
     # Run demo flow
     user_query = "show my contact details"
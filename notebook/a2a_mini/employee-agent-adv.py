@@ -1,6 +1,7 @@
 import os
 import time
-from typing import List
+import asyncio
+from typing import Dict, List
 from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent, tool
 from strands.tools.mcp.mcp_client import MCPClient
@@ -10,15 +11,20 @@ from strands.models.anthropic import AnthropicModel
 from dotenv import load_dotenv
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import Request
+from fastapi import Response
 from pydantic import BaseModel
 
 from employee_data import EMPLOYEES
 load_dotenv()
 
+# Opt-in blocking-call monitor: asyncio logs loop steps longer than this (e.g. 10)
+ASYNCIO_BLOCKING_MS = float(os.getenv("ASYNCIO_BLOCKING_MS", "0"))
+
 # Define URLs correctly - do not use os.environ.get() for literal values
 EMPLOYEE_INFO_URL = "http://localhost:8002/mcp/"
 EMPLOYEE_AGENT_URL = "http://localhost:8001/"
+_AGENT_ADDR = urlparse(EMPLOYEE_AGENT_URL)
+EMPLOYEE_AGENT_HOST, EMPLOYEE_AGENT_PORT = _AGENT_ADDR.hostname, int(_AGENT_ADDR.port)
 
 # Create the MCP client
 employee_mcp_client = MCPClient(lambda: streamablehttp_client(EMPLOYEE_INFO_URL))
@@ -35,15 +41,25 @@ class EmployeeMatches(BaseModel):
     matches: List[EmployeeMatch]
 
 
+# Case-folded name -> prebuilt matches, built once from the static EMPLOYEES data
+_IDX: Dict[str, List[EmployeeMatch]] = {}
+for _emp in EMPLOYEES:
+    if isinstance(_emp, dict):
+        _IDX.setdefault(_emp.get("name", "").casefold(), []).append(
+            EmployeeMatch(name=_emp["name"], email=_emp["email"], address=_emp["address"])  # type: ignore[index]
+        )
+
+# Tool responses are pre-serialized too: the data is read-only, so a lookup
+# returns the final JSON string
+_JSON_IDX: Dict[str, str] = {
+    k: EmployeeMatches(matches=v).model_dump_json(exclude_none=True) for k, v in _IDX.items()
+}
+_EMPTY_JSON = EmployeeMatches(matches=[]).model_dump_json(exclude_none=True)
+
+
 def build_employee_structured(name: str) -> EmployeeMatches:
     """Pure helper that builds structured matches from local data."""
-    name_lc = (name or "").strip().lower()
-    rows = [
-        EmployeeMatch(name=e["name"], email=e["email"], address=e["address"])  # type: ignore[index]
-        for e in EMPLOYEES
-        if isinstance(e, dict) and e.get("name", "").lower() == name_lc
-    ]
-    return EmployeeMatches(matches=rows)
+    return EmployeeMatches(matches=_IDX.get((name or "").strip().casefold(), []))
 
 
 @tool
@@ -52,8 +68,7 @@ def get_employee_structured(name: str) -> str:
 
     Uses local data; exact name match (case-insensitive).
     """
-    result = build_employee_structured(name)
-    return result.model_dump_json(exclude_none=True)
+    return _JSON_IDX.get((name or "").strip().casefold(), _EMPTY_JSON)
 
 model = AnthropicModel(
     client_args={
@@ -86,8 +101,8 @@ with employee_mcp_client:
     # Create A2A server
     a2a_server = A2AServer(
         agent=employee_agent,
-        host=urlparse(EMPLOYEE_AGENT_URL).hostname,
-        port=int(urlparse(EMPLOYEE_AGENT_URL).port),
+        host=EMPLOYEE_AGENT_HOST,
+        port=EMPLOYEE_AGENT_PORT,
     )
 
     # Advanced customization: access FastAPI app and add middleware/routes
@@ -102,27 +117,57 @@ with employee_mcp_client:
         allow_headers=["*"],
     )
 
-    # Simple timing middleware
-    @app.middleware("http")
-    async def add_process_time_header(request: Request, call_next):
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        process_time = (time.perf_counter() - start_time)
-        response.headers["X-Process-Time"] = f"{process_time:.4f}s"
-        return response
-
-    # Custom health and utility endpoints
-    @app.get("/healthz")
-    def healthz():
-        return {"status": "ok", "service": "employee-agent"}
+    # Simple timing middleware (plain ASGI, so no call_next task per request)
+    class ProcessTimeMiddleware:
+        def __init__(self, app) -> None:
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            if scope["type"] != "http":
+                await self.app(scope, receive, send)
+                return
+            start_time = time.perf_counter()
+
+            async def send_with_time(message):
+                if message["type"] == "http.response.start":
+                    process_time = time.perf_counter() - start_time
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-process-time", b"%.4fs" % process_time),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_time)
+
+    app.add_middleware(ProcessTimeMiddleware)
+
+    @app.on_event("startup")
+    async def monitor_blocking_calls():
+        if ASYNCIO_BLOCKING_MS > 0:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = ASYNCIO_BLOCKING_MS / 1000
+
+    # Custom health and utility endpoints. The payloads are constant, so they are
+    # encoded once; async handlers also skip the threadpool hop sync routes take.
+    HEALTHZ_JSON = b'{"status":"ok","service":"employee-agent"}'
+    VERSION_JSON = b'{"version":"0.0.1","agent":"Employee Agent"}'
+
+    @app.api_route("/healthz", methods=["GET", "HEAD"])
+    async def healthz():
+        return Response(content=HEALTHZ_JSON, media_type="application/json")
 
     @app.get("/version")
-    def version():
-        return {"version": "0.0.1", "agent": "Employee Agent"}
+    async def version():
+        return Response(content=VERSION_JSON, media_type="application/json")
 
-    @app.get("/employee/matches/{name}")
+    # Serves the pre-serialized JSON; the model is declared for OpenAPI only
+    @app.get("/employee/matches/{name}", responses={200: {"model": EmployeeMatches}})
     def employee_matches(name: str):
-        return build_employee_structured(name).model_dump(exclude_none=True)
+        return Response(
+            content=_JSON_IDX.get((name or "").strip().casefold(), _EMPTY_JSON),
+            media_type="application/json",
+        )
 
     # Serve customized app via uvicorn
     if __name__ == "__main__":
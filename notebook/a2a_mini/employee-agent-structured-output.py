@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent, tool
 from strands.tools.mcp.mcp_client import MCPClient
@@ -15,6 +15,8 @@ load_dotenv()
 # Define URLs correctly - do not use os.environ.get() for literal values
 EMPLOYEE_INFO_URL = "http://localhost:8002/mcp/"
 EMPLOYEE_AGENT_URL = "http://localhost:8001/"
+_AGENT_ADDR = urlparse(EMPLOYEE_AGENT_URL)
+EMPLOYEE_AGENT_HOST, EMPLOYEE_AGENT_PORT = _AGENT_ADDR.hostname, int(_AGENT_ADDR.port)
 
 # Create the MCP client
 employee_mcp_client = MCPClient(lambda: streamablehttp_client(EMPLOYEE_INFO_URL))
@@ -31,20 +33,29 @@ class EmployeeMatches(BaseModel):
     matches: List[EmployeeMatch]
 
 
+# Case-folded name -> prebuilt matches, built once from the static EMPLOYEES data
+_IDX: Dict[str, List[EmployeeMatch]] = {}
+for _emp in EMPLOYEES:
+    if isinstance(_emp, dict):
+        _IDX.setdefault(_emp.get("name", "").casefold(), []).append(
+            EmployeeMatch(name=_emp["name"], email=_emp["email"], address=_emp["address"])  # type: ignore[index]
+        )
+
+# Tool responses are pre-serialized too: the data is read-only, so a lookup
+# returns the final JSON string
+_JSON_IDX: Dict[str, str] = {
+    k: EmployeeMatches(matches=v).model_dump_json(exclude_none=True) for k, v in _IDX.items()
+}
+_EMPTY_JSON = EmployeeMatches(matches=[]).model_dump_json(exclude_none=True)
+
+
 @tool
 def get_employee_structured(name: str) -> str:
     """Return structured JSON with matching employees (name, email, address).
 
     Uses local data; exact name match (case-insensitive).
     """
-    name_lc = (name or "").strip().lower()
-    rows = [
-        EmployeeMatch(name=e["name"], email=e["email"], address=e["address"])  # type: ignore[index]
-        for e in EMPLOYEES
-        if isinstance(e, dict) and e.get("name", "").lower() == name_lc
-    ]
-    result = EmployeeMatches(matches=rows)
-    return result.model_dump_json(exclude_none=True)
+    return _JSON_IDX.get((name or "").strip().casefold(), _EMPTY_JSON)
 
 model = AnthropicModel(
     client_args={
@@ -77,8 +88,8 @@ with employee_mcp_client:
     # Create A2A server
     a2a_server = A2AServer(
         agent=employee_agent, 
-        host=urlparse(EMPLOYEE_AGENT_URL).hostname, 
-        port=int(urlparse(EMPLOYEE_AGENT_URL).port)
+        host=EMPLOYEE_AGENT_HOST,
+        port=EMPLOYEE_AGENT_PORT
     )
     
     # Start the server
@@ -1,8 +1,10 @@
 import os
+import json
+import logging
+import asyncio
 import time
 import uuid
-import threading
-from typing import List
+from typing import Dict, List
 from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent, tool
 from strands.tools.mcp.mcp_client import MCPClient
@@ -12,16 +14,27 @@ from strands.models.anthropic import AnthropicModel
 from dotenv import load_dotenv
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import Request, Response, HTTPException
+from fastapi import Response
+from fastapi.responses import JSONResponse
 from starlette import status
 from pydantic import BaseModel
 
 from employee_data import EMPLOYEES
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Define URLs correctly - do not use os.environ.get() for literal values
 EMPLOYEE_INFO_URL = "http://localhost:8002/mcp/"
 EMPLOYEE_AGENT_URL = "http://localhost:8001/"
+_AGENT_ADDR = urlparse(EMPLOYEE_AGENT_URL)
+EMPLOYEE_AGENT_HOST, EMPLOYEE_AGENT_PORT = _AGENT_ADDR.hostname, int(_AGENT_ADDR.port)
 
 # Create the MCP client
 employee_mcp_client = MCPClient(lambda: streamablehttp_client(EMPLOYEE_INFO_URL))
@@ -38,15 +51,25 @@ class EmployeeMatches(BaseModel):
     matches: List[EmployeeMatch]
 
 
+# Case-folded name -> prebuilt matches, built once from the static EMPLOYEES data
+_IDX: Dict[str, List[EmployeeMatch]] = {}
+for _emp in EMPLOYEES:
+    if isinstance(_emp, dict):
+        _IDX.setdefault(_emp.get("name", "").casefold(), []).append(
+            EmployeeMatch(name=_emp["name"], email=_emp["email"], address=_emp["address"])  # type: ignore[index]
+        )
+
+# Tool responses are pre-serialized too: the data is read-only, so a lookup
+# returns the final JSON string
+_JSON_IDX: Dict[str, str] = {
+    k: EmployeeMatches(matches=v).model_dump_json(exclude_none=True) for k, v in _IDX.items()
+}
+_EMPTY_JSON = EmployeeMatches(matches=[]).model_dump_json(exclude_none=True)
+
+
 def build_employee_structured(name: str) -> EmployeeMatches:
     """Pure helper that builds structured matches from local data."""
-    name_lc = (name or "").strip().lower()
-    rows = [
-        EmployeeMatch(name=e["name"], email=e["email"], address=e["address"])  # type: ignore[index]
-        for e in EMPLOYEES
-        if isinstance(e, dict) and e.get("name", "").lower() == name_lc
-    ]
-    return EmployeeMatches(matches=rows)
+    return EmployeeMatches(matches=_IDX.get((name or "").strip().casefold(), []))
 
 
 @tool
@@ -55,8 +78,7 @@ def get_employee_structured(name: str) -> str:
 
     Uses local data; exact name match (case-insensitive).
     """
-    result = build_employee_structured(name)
-    return result.model_dump_json(exclude_none=True)
+    return _JSON_IDX.get((name or "").strip().casefold(), _EMPTY_JSON)
 
 # model = AnthropicModel(
 #     client_args={
@@ -96,8 +118,8 @@ with employee_mcp_client:
     # Create A2A server
     a2a_server = A2AServer(
         agent=employee_agent,
-        host=urlparse(EMPLOYEE_AGENT_URL).hostname,
-        port=int(urlparse(EMPLOYEE_AGENT_URL).port),
+        host=EMPLOYEE_AGENT_HOST,
+        port=EMPLOYEE_AGENT_PORT,
     )
 
     # Advanced customization: access FastAPI app and add middleware/routes
@@ -116,111 +138,175 @@ with employee_mcp_client:
 
     API_KEY = os.getenv("EMPLOYEE_AGENT_API_KEY", "dev-key")
 
+    # Counter slots
+    _REQ, _ERR, _A2A_STARTED, _A2A_DONE, _DUR_US = range(5)
+
     class MetricsCollector:
+        # Only EdgeMiddleware updates these, and it runs on the single event-loop
+        # thread; an increment never awaits, so plain counters need no lock.
         def __init__(self) -> None:
-            self.lock = threading.Lock()
-            self.total_requests = 0
-            self.total_errors = 0
-            self.a2a_tasks_started = 0
-            self.a2a_tasks_completed = 0
-            self.total_duration_ms = 0.0
+            self.counts = [0] * 5
 
         def on_request(self, is_a2a: bool) -> None:
-            with self.lock:
-                self.total_requests += 1
-                if is_a2a:
-                    self.a2a_tasks_started += 1
-
-        def on_response(self, is_a2a: bool, ok: bool, duration_ms: float) -> None:
-            with self.lock:
-                if not ok:
-                    self.total_errors += 1
-                if is_a2a and ok:
-                    self.a2a_tasks_completed += 1
-                self.total_duration_ms += duration_ms
+            c = self.counts
+            c[_REQ] += 1
+            if is_a2a:
+                c[_A2A_STARTED] += 1
+
+        def on_response(self, is_a2a: bool, ok: bool, duration_us: int) -> None:
+            c = self.counts
+            if not ok:
+                c[_ERR] += 1
+            elif is_a2a:
+                c[_A2A_DONE] += 1
+            c[_DUR_US] += duration_us  # integer microseconds, avoids float accumulation
 
         def to_dict(self) -> dict:
-            with self.lock:
-                avg_ms = (
-                    self.total_duration_ms / self.total_requests
-                    if self.total_requests > 0
-                    else 0.0
-                )
-                return {
-                    "total_requests": self.total_requests,
-                    "total_errors": self.total_errors,
-                    "a2a_tasks_started": self.a2a_tasks_started,
-                    "a2a_tasks_completed": self.a2a_tasks_completed,
-                    "avg_duration_ms": round(avg_ms, 3),
-                    "total_duration_ms": round(self.total_duration_ms, 3),
-                }
+            total, errors, started, done, dur_us = self.counts
+            total_ms = dur_us / 1000.0
+            return {
+                "total_requests": total,
+                "total_errors": errors,
+                "a2a_tasks_started": started,
+                "a2a_tasks_completed": done,
+                "avg_duration_ms": round(total_ms / total, 3) if total else 0.0,
+                "total_duration_ms": round(total_ms, 3),
+            }
 
     metrics = MetricsCollector()
 
-    @app.middleware("http")
-    async def request_id_middleware(request: Request, call_next):
-        # Accept incoming X-Request-ID or generate a new one
-        req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-        request.state.request_id = req_id
-        response: Response
-        try:
-            response = await call_next(request)
-        finally:
-            pass
-        response.headers["X-Request-ID"] = req_id
-        return response
-
-    @app.middleware("http")
-    async def api_key_middleware(request: Request, call_next):
-        # Protect selected custom routes; allow healthz to be public
-        path = request.url.path
-        protected_prefixes = ("/employee/", "/version")
-        if path.startswith(protected_prefixes):
-            key = request.headers.get("x-api-key") or request.headers.get("X-API-Key")
-            if not key or key != API_KEY:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API key")
-        return await call_next(request)
-
-    @app.middleware("http")
-    async def metrics_middleware(request: Request, call_next):
-        start = time.perf_counter()
-        path = request.url.path
-        method = request.method.upper()
-        is_a2a = (path == "/" and method == "POST")
-        metrics.on_request(is_a2a)
+    # /metrics serves this pre-encoded snapshot; the background task below
+    # refreshes it so scrapes never sum shards or encode JSON themselves.
+    METRICS_SNAPSHOT_S = float(os.getenv("METRICS_SNAPSHOT_S", "1"))
+    app.state.metrics_json = b"{}"
+
+    def _encode_metrics() -> bytes:
+        d = metrics.to_dict()
+        return orjson.dumps(d) if orjson is not None else json.dumps(d, separators=(",", ":")).encode()
+
+    async def _snapshot_loop():
+        while True:
+            app.state.metrics_json = _encode_metrics()
+            await asyncio.sleep(METRICS_SNAPSHOT_S)
+
+    # Opt-in: the warm-up is a (paid) Bedrock call and can hold startup for up to 10 s
+    BEDROCK_WARMUP = os.getenv("BEDROCK_WARMUP", "0") == "1"
+
+    @app.on_event("startup")
+    async def warm_up_model():
+        # 1-token call so the first A2A task doesn't pay credential lookup + TLS setup
+        if not BEDROCK_WARMUP:
+            return
+        agent_model = employee_agent.model
         try:
-            response = await call_next(request)
-            ok = response.status_code < 500
-            return response
-        except Exception:
+            await asyncio.wait_for(
+                asyncio.to_thread(
+                    agent_model.client.converse,
+                    modelId=agent_model.config["model_id"],
+                    messages=[{"role": "user", "content": [{"text": "hi"}]}],
+                    inferenceConfig={"maxTokens": 1},
+                ),
+                timeout=10,
+            )
+        except Exception as e:
+            logger.warning("Bedrock warm-up failed: %s", e)
+
+    @app.on_event("startup")
+    async def start_metrics_snapshot():
+        app.state.metrics_task = asyncio.create_task(_snapshot_loop())
+
+    @app.on_event("shutdown")
+    async def stop_metrics_snapshot():
+        app.state.metrics_task.cancel()
+
+    API_KEY_B = API_KEY.encode()
+    PROTECTED_PREFIXES = ("/employee/", "/version")  # healthz stays public
+
+    class EdgeMiddleware:
+        """Request ID, API-key check and metrics as one pure ASGI layer.
+
+        Replaces three ``@app.middleware("http")`` layers, each of which cost a
+        ``call_next`` task and a memory stream per request.
+        """
+
+        def __init__(self, app) -> None:
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            if scope["type"] != "http":
+                await self.app(scope, receive, send)
+                return
+
+            start = time.perf_counter_ns()
+            is_a2a = (scope["method"] == "POST" and scope["path"] == "/")  # ASGI method is already upper-case
+            metrics.on_request(is_a2a)
+
+            # Accept incoming X-Request-ID or generate a new one (header names are lower-case bytes)
+            req_id = key = None
+            for name, value in scope["headers"]:
+                if name == b"x-request-id":
+                    req_id = value
+                elif name == b"x-api-key":
+                    key = value
+            if not req_id:
+                req_id = uuid.uuid4().hex.encode()
+            scope.setdefault("state", {})["request_id"] = req_id.decode("latin-1")
+
+            status_code = 500
+
+            async def send_with_headers(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    dur_ms = (time.perf_counter_ns() - start) / 1_000_000
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-request-id", req_id),
+                        # Add duration header for convenience (time to first byte)
+                        (b"x-process-time", b"%.2fms" % dur_ms),
+                    ]
+                await send(message)
+
             ok = False
-            raise
-        finally:
-            dur_ms = (time.perf_counter() - start) * 1000.0
-            metrics.on_response(is_a2a, ok, dur_ms)
             try:
-                # Add duration header for convenience
-                if 'response' in locals():
-                    response.headers["X-Process-Time"] = f"{dur_ms:.2f}ms"
-            except Exception:
-                pass
-
-    # Custom health and utility endpoints
-    @app.get("/healthz")
-    def healthz():
-        return {"status": "ok", "service": "employee-agent"}
+                if scope["path"].startswith(PROTECTED_PREFIXES) and key != API_KEY_B:
+                    response = JSONResponse(
+                        {"detail": "Invalid or missing API key"},
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                    )
+                    await response(scope, receive, send_with_headers)
+                else:
+                    await self.app(scope, receive, send_with_headers)
+                ok = status_code < 500
+            finally:
+                metrics.on_response(is_a2a, ok, (time.perf_counter_ns() - start) // 1000)
+
+    app.add_middleware(EdgeMiddleware)
+
+    # Custom health and utility endpoints. The payloads are constant, so they are
+    # encoded once; async handlers also skip the threadpool hop sync routes take.
+    HEALTHZ_JSON = b'{"status":"ok","service":"employee-agent"}'
+    VERSION_JSON = b'{"version":"0.0.1","agent":"Employee Agent"}'
+
+    @app.api_route("/healthz", methods=["GET", "HEAD"])
+    async def healthz():
+        return Response(content=HEALTHZ_JSON, media_type="application/json")
 
     @app.get("/version")
-    def version():
-        return {"version": "0.0.1", "agent": "Employee Agent"}
+    async def version():
+        return Response(content=VERSION_JSON, media_type="application/json")
 
-    @app.get("/employee/matches/{name}")
+    # Serves the pre-serialized JSON; the model is declared for OpenAPI only
+    @app.get("/employee/matches/{name}", responses={200: {"model": EmployeeMatches}})
     def employee_matches(name: str):
-        return build_employee_structured(name).model_dump(exclude_none=True)
+        return Response(
+            content=_JSON_IDX.get((name or "").strip().casefold(), _EMPTY_JSON),
+            media_type="application/json",
+        )
 
     @app.get("/metrics")
     def get_metrics():
-        return metrics.to_dict()
+        return Response(content=app.state.metrics_json, media_type="application/json")
 
     # Serve customized app via uvicorn
     if __name__ == "__main__":
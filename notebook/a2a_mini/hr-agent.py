@@ -1,5 +1,7 @@
 import os
+import asyncio
 import logging
+from collections import OrderedDict
 from uuid import uuid4
 
 import uvicorn
@@ -10,7 +12,7 @@ from strands_tools.a2a_client import A2AClientToolProvider
 from fastapi import FastAPI
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
 from a2a.types import Message, Part, Role, TextPart
@@ -25,6 +27,88 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="HR Agent API")
 
+DEFAULT_TIMEOUT = 300  # 5 minutes
+
+# HTTP/2 only when `h2` is installed
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+@app.on_event("startup")
+async def open_http_client():
+    # one pooled client for every A2A hop, so connections are reused across requests;
+    # over HTTP/2 concurrent calls to an agent multiplex onto one connection
+    app.state.httpx = httpx.AsyncClient(
+        timeout=DEFAULT_TIMEOUT,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0),
+        http2=_HTTP2,
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.httpx.aclose()
+
+
+# base URL -> resolved agent card, and (base URL, streaming) -> A2A client built
+# from it over the shared httpx client; both are idempotent per URL, so repeat
+# calls skip the discovery round trip and the factory work. URLs come from
+# requests, so both are LRUs bounded at _A2A_CACHE_MAX. Evicted clients are
+# just dropped: they own no connections (closing one would close the shared
+# app.state.httpx pool).
+_A2A_CACHE_MAX = 256
+_AGENT_CARDS: "OrderedDict[str, Any]" = OrderedDict()
+_A2A_CLIENTS: "OrderedDict[Tuple[str, bool], Any]" = OrderedDict()
+# one lock per URL being resolved, so unrelated agents don't wait on each other
+_CARD_LOCKS: Dict[str, asyncio.Lock] = {}
+
+
+def _lru_get(cache: OrderedDict, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key, value):
+    cache[key] = value
+    if len(cache) > _A2A_CACHE_MAX:
+        cache.popitem(last=False)
+    return value
+
+
+async def _get_agent_card(httpx_client: httpx.AsyncClient, base_url: str):
+    card = _lru_get(_AGENT_CARDS, base_url)
+    if card is None:
+        lock = _CARD_LOCKS.setdefault(base_url, asyncio.Lock())
+        async with lock:
+            # another request may have resolved it while we waited
+            card = _lru_get(_AGENT_CARDS, base_url)
+            if card is None:
+                try:
+                    card = _lru_put(_AGENT_CARDS, base_url, await A2ACardResolver(
+                        httpx_client=httpx_client, base_url=base_url
+                    ).get_agent_card())
+                finally:
+                    # queued waiters keep their reference; the dict only tracks
+                    # URLs still being resolved
+                    if _CARD_LOCKS.get(base_url) is lock:
+                        del _CARD_LOCKS[base_url]
+    return card
+
+
+async def _get_a2a_client(base_url: str, streaming: bool = False):
+    client = _lru_get(_A2A_CLIENTS, (base_url, streaming))
+    if client is None:
+        httpx_client = app.state.httpx
+        agent_card = await _get_agent_card(httpx_client, base_url)
+        config = ClientConfig(httpx_client=httpx_client, streaming=streaming)
+        client = _lru_put(_A2A_CLIENTS, (base_url, streaming), ClientFactory(config).create(agent_card))
+    return client
+
 class QuestionRequest(BaseModel):
     question: str
 
@@ -55,13 +139,41 @@ def health_check():
 #     }
 # )
 
+from botocore.config import Config as BotocoreConfig
 from strands.models import BedrockModel
 model = BedrockModel(
     model_id="us.anthropic.claude-sonnet-4-20250514-v1:0",
     region_name="us-west-2",
-    temperature=0
+    temperature=0,
+    # enough pooled connections for concurrent requests; standard retry mode backs off on throttling
+    boto_client_config=BotocoreConfig(max_pool_connections=32, retries={"mode": "standard"}),
 )
 
+# Opt-in: the warm-up is a (paid) Bedrock call and can hold startup for up to 10 s
+BEDROCK_WARMUP = os.getenv("BEDROCK_WARMUP", "0") == "1"
+
+
+@app.on_event("startup")
+async def warm_up_model():
+    """Pay the credential lookup + TLS handshake before the first user request.
+
+    A 1-token converse call; failures only log, the server starts regardless.
+    """
+    if not BEDROCK_WARMUP:
+        return
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(
+                model.client.converse,
+                modelId=model.config["model_id"],
+                messages=[{"role": "user", "content": [{"text": "hi"}]}],
+                inferenceConfig={"maxTokens": 1},
+            ),
+            timeout=10,
+        )
+    except Exception as e:
+        logger.warning("Bedrock warm-up failed: %s", e)
+
 # WRITER_API_KEY = os.getenv("WRITER_API_KEY")
 # model = ChatWriter(
 #     model='palmyra-x5',
@@ -69,11 +181,48 @@ model = BedrockModel(
 # )
 
 
+# One tool provider per set of agent URLs: it discovers and caches the remote
+# agent cards, so rebuilding it per request repeats that discovery.
+# Construction never awaits, so check-and-set is atomic on the event loop.
+# Providers are only used from the server loop (handlers await invoke_async
+# rather than calling agent(...), which would run on a fresh loop per call), so
+# the httpx client a provider opens stays bound to that one loop.
+# Keys come from requests, so the cache is an LRU bounded at _PROVIDER_CACHE_MAX.
+_PROVIDER_CACHE_MAX = 64
+_PROVIDER_CACHE: "OrderedDict[Tuple[str, ...], A2AClientToolProvider]" = OrderedDict()
+_CLOSING: set = set()
+
+
+def _close_provider(provider: A2AClientToolProvider) -> None:
+    # the provider opens its own httpx client on first use; release its connections
+    client = getattr(provider, "_httpx_client", None)
+    if client is not None:
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        _CLOSING.add(task)
+        task.add_done_callback(_CLOSING.discard)
+
+
+def _get_provider(urls: List[str]) -> A2AClientToolProvider:
+    key = tuple(sorted(urls))
+    provider = _PROVIDER_CACHE.get(key)
+    if provider is None:
+        provider = _PROVIDER_CACHE[key] = A2AClientToolProvider(known_agent_urls=list(key))
+        if len(_PROVIDER_CACHE) > _PROVIDER_CACHE_MAX:
+            _close_provider(_PROVIDER_CACHE.popitem(last=False)[1])
+    else:
+        _PROVIDER_CACHE.move_to_end(key)
+    return provider
+
+
+def _get_agent(urls: List[str]) -> Agent:
+    """Fresh Agent per request (its conversation history is per call) over a cached provider."""
+    return Agent(model=model, tools=_get_provider(urls).tools)
+
+
 @app.post("/query")
 async def ask_agent(request: QuestionRequest):
-    provider = A2AClientToolProvider(known_agent_urls=[EMPLOYEE_AGENT_URL])
-    agent = Agent(model=model, tools=provider.tools)
-    response = agent(request.question)
+    agent = _get_agent([EMPLOYEE_AGENT_URL])
+    response = await agent.invoke_async(request.question)
     print(f"Response: {response}")
     return response
 
@@ -81,9 +230,7 @@ async def ask_agent(request: QuestionRequest):
 @app.post("/inquire")
 async def ask_agent(request: QuestionRequest):
     async def generate():
-        provider = A2AClientToolProvider(known_agent_urls=[EMPLOYEE_AGENT_URL])
-
-        agent = Agent(model=model, tools=provider.tools)
+        agent = _get_agent([EMPLOYEE_AGENT_URL])
 
         stream_response = agent.stream_async(request.question)
 
@@ -105,9 +252,8 @@ async def client_tool(request: ToolRequest):
     - Returns the agent's synchronous response to `question`.
     """
     known_urls = request.agent_urls or [EMPLOYEE_AGENT_URL]
-    provider = A2AClientToolProvider(known_agent_urls=known_urls)
-    agent = Agent(model=model, tools=provider.tools)
-    response = agent(request.question)
+    agent = _get_agent(known_urls)
+    response = await agent.invoke_async(request.question)
     return {"response": response, "agent_urls": known_urls}
 
 
@@ -121,57 +267,79 @@ class A2AAgentTool:
     @tool
     async def call_agent(self, message: str) -> str:
         try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
-                resolver = A2ACardResolver(httpx_client=httpx_client, base_url=self.agent_url)
-                agent_card = await resolver.get_agent_card()
-
-                config = ClientConfig(httpx_client=httpx_client, streaming=False)
-                client = ClientFactory(config).create(agent_card)
-
-                msg = Message(
-                    kind="message",
-                    role=Role.user,
-                    parts=[Part(TextPart(kind="text", text=message))],
-                    message_id=uuid4().hex,
-                )
-
-                async for event in client.send_message(msg):
-                    if isinstance(event, Message):
-                        # Concatenate text parts
-                        out = []
-                        for p in event.parts:
-                            try:
-                                if hasattr(p, "text") and p.text:
-                                    out.append(p.text)
-                            except Exception:
-                                continue
-                        return "".join(out) or "<empty response>"
-
-                    # Fallback: return JSON dump for non-Message responses
-                    try:
-                        return event.model_dump_json(exclude_none=True)  # type: ignore[attr-defined]
-                    except Exception:
-                        return str(event)
+            client = await _get_a2a_client(self.agent_url)
+
+            msg = Message(
+                kind="message",
+                role=Role.user,
+                parts=[Part(TextPart(kind="text", text=message))],
+                message_id=uuid4().hex,
+            )
+
+            async for event in client.send_message(msg):
+                if isinstance(event, Message):
+                    # Concatenate text parts
+                    out = []
+                    for p in event.parts:
+                        try:
+                            if hasattr(p, "text") and p.text:
+                                out.append(p.text)
+                        except Exception:
+                            continue
+                    return "".join(out) or "<empty response>"
+
+                # Fallback: return JSON dump for non-Message responses
+                try:
+                    return event.model_dump_json(exclude_none=True)  # type: ignore[attr-defined]
+                except Exception:
+                    return str(event)
 
             return f"No response received from {self.agent_name}"
         except Exception as e:
             return f"Error contacting {self.agent_name}: {str(e)}"
 
 
+# One wrapper per (agent URL as given, name): the URL is normalised once, and
+# the A2A client behind it is cached as well
+_AGENT_TOOLS: Dict[Tuple[str, str], A2AAgentTool] = {}
+
+
+def _get_agent_tool(agent_url: str, agent_name: str = "Remote Agent") -> A2AAgentTool:
+    key = (agent_url, agent_name)
+    remote = _AGENT_TOOLS.get(key)
+    if remote is None:
+        remote = A2AAgentTool(agent_url=agent_url, agent_name=agent_name)
+        if len(_AGENT_TOOLS) < 256:  # keys come from requests, so keep the cache bounded
+            _AGENT_TOOLS[key] = remote
+    return remote
+
+
 @app.post("/client_agent_tool")
 async def client_agent_tool(request: AgentToolRequest):
     """Call another A2A agent using an A2AAgentTool wrapper.
 
     Defaults to the Employee Agent when no URL is provided.
     """
-    agent_url = (request.agent_url or EMPLOYEE_AGENT_URL).rstrip("/") + "/"
     agent_name = request.agent_name or "Employee Agent"
 
-    remote = A2AAgentTool(agent_url=agent_url, agent_name=agent_name)
+    remote = _get_agent_tool(request.agent_url or EMPLOYEE_AGENT_URL, agent_name)
     result = await remote.call_agent(request.question)
-    return {"response": result, "agent_url": agent_url, "agent_name": agent_name}
+    return {"response": result, "agent_url": remote.agent_url, "agent_name": agent_name}
+
+
+@app.post("/client_fanout")
+async def client_fanout(request: ToolRequest):
+    """Ask every agent in `agent_urls` the same question concurrently.
+
+    Total latency is that of the slowest agent rather than the sum; a failing
+    agent yields its error text without cancelling the others.
+    """
+    known_urls = request.agent_urls or [EMPLOYEE_AGENT_URL]
+    results = await asyncio.gather(
+        *(_get_agent_tool(url).call_agent(request.question) for url in known_urls)
+    )
+    return {"responses": dict(zip(known_urls, results)), "agent_urls": known_urls}
 
-DEFAULT_TIMEOUT = 300  # 5 minutes
 
 def create_message(*, role: Role = Role.user, text: str) -> Message:
     return Message(
@@ -182,48 +350,128 @@ def create_message(*, role: Role = Role.user, text: str) -> Message:
     )
 
 
+async def _client_sync_once(question: str) -> Dict[str, Any]:
+    """Send one question to the Employee Agent; return the first non-streaming response."""
+    # Non-streaming client, reused across requests
+    client = await _get_a2a_client(EMPLOYEE_AGENT_URL)
+
+    # Build and send message
+    msg = create_message(text=question)
+
+    async for event in client.send_message(msg):
+        # Message response
+        if isinstance(event, Message):
+            payload = event.model_dump(exclude_none=True)
+            logger.info("client_sync message: %s", payload)
+            return payload
+
+        # Task + UpdateEvent pair
+        if isinstance(event, tuple) and len(event) == 2:
+            task, update_event = event
+            resp = {
+                "task": task.model_dump(exclude_none=True),
+                "update": update_event.model_dump(exclude_none=True) if update_event else None,
+            }
+            logger.info("client_sync task/update: %s", resp)
+            return resp
+
+        # Fallback for other response types
+        try:
+            payload = event.model_dump(exclude_none=True)  # type: ignore[attr-defined]
+        except Exception:
+            payload = {"response": str(event)}
+        logger.info("client_sync other: %s", payload)
+        return payload
+
+
+# ---- /client_sync micro-batching ---------------------------------------------
+# Opt-in: requests arriving within BATCH_WINDOW_MS are drained together (up to
+# MAX_BATCH); identical questions in a batch share one A2A call (and one result
+# object), distinct ones still go out concurrently since the Employee Agent has
+# no batch API. Each request may wait up to the window, so the default of 0
+# keeps batching off and /client_sync calls the agent directly.
+BATCH_WINDOW_MS = float(os.getenv("CLIENT_SYNC_BATCH_WINDOW_MS", "0"))
+MAX_BATCH = int(os.getenv("CLIENT_SYNC_MAX_BATCH", "16"))
+_IN_FLIGHT: set = set()
+
+
+async def _resolve_batch(question: str, futures: List[asyncio.Future]) -> None:
+    try:
+        result = await _client_sync_once(question)
+    except Exception as e:
+        for fut in futures:
+            if not fut.done():
+                fut.set_exception(e)
+    else:
+        for fut in futures:
+            if not fut.done():
+                fut.set_result(result)
+
+
+async def _batch_worker(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_WINDOW_MS / 1000
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        by_question: Dict[str, List[asyncio.Future]] = {}
+        for question, fut in batch:
+            by_question.setdefault(question, []).append(fut)
+        for question, futures in by_question.items():
+            # not awaited here, so the next batch can start filling meanwhile;
+            # the set keeps a strong reference until the call finishes
+            task = asyncio.create_task(_resolve_batch(question, futures))
+            _IN_FLIGHT.add(task)
+            task.add_done_callback(_IN_FLIGHT.discard)
+
+
+@app.on_event("startup")
+async def start_batch_worker():
+    if BATCH_WINDOW_MS > 0:
+        app.state.batch_queue = asyncio.Queue()
+        app.state.batch_task = asyncio.create_task(_batch_worker(app.state.batch_queue))
+
+
+@app.on_event("shutdown")
+async def stop_batch_worker():
+    task = getattr(app.state, "batch_task", None)
+    if task is not None:
+        task.cancel()
+
+
 @app.post("/client_sync")
 async def client_sync(request: QuestionRequest):
     """Synchronous A2A client call to the Employee Agent using JSON-RPC.
 
     Returns the first non-streaming response (Message or Task/update pair).
     """
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
-        # Resolve agent card from the Employee Agent
-        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=EMPLOYEE_AGENT_URL)
-        agent_card = await resolver.get_agent_card()
-
-        # Create a non-streaming client
-        config = ClientConfig(httpx_client=httpx_client, streaming=False)
-        client = ClientFactory(config).create(agent_card)
-
-        # Build and send message
-        msg = create_message(text=request.question)
-
-        async for event in client.send_message(msg):
-            # Message response
-            if isinstance(event, Message):
-                payload = event.model_dump(exclude_none=True)
-                logger.info("client_sync message: %s", payload)
-                return payload
-
-            # Task + UpdateEvent pair
-            if isinstance(event, tuple) and len(event) == 2:
-                task, update_event = event
-                resp = {
-                    "task": task.model_dump(exclude_none=True),
-                    "update": update_event.model_dump(exclude_none=True) if update_event else None,
-                }
-                logger.info("client_sync task/update: %s", resp)
-                return resp
-
-            # Fallback for other response types
-            try:
-                payload = event.model_dump(exclude_none=True)  # type: ignore[attr-defined]
-            except Exception:
-                payload = {"response": str(event)}
-            logger.info("client_sync other: %s", payload)
-            return payload
+    queue = getattr(app.state, "batch_queue", None)
+    if queue is None:
+        return await _client_sync_once(request.question)
+    fut = asyncio.get_running_loop().create_future()
+    await queue.put((request.question, fut))
+    return await fut
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvicorn picks uvloop and httptools on its own when they are installed.
+    # Each worker is a separate process with its own clients, caches and batch queue.
+    workers = int(os.getenv("HR_AGENT_WORKERS", "1"))
+    if workers > 1:
+        # multiple workers need an import string rather than the app object
+        uvicorn.run(
+            "hr-agent:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -4,13 +4,17 @@ from employee_data import EMPLOYEES
 
 mcp = FastMCP("employee-server", stateless_http=True, host="0.0.0.0", port=8002)
 
+# name -> matching employee records, built once from the static EMPLOYEES data
+_INDEX: dict[str, list[dict]] = {}
+for _emp in EMPLOYEES:
+    _INDEX.setdefault(_emp["name"], []).append(_emp)
+
 
 @mcp.tool()
 def get_employee_data_with_name(name: str) -> list[dict]:
     """employee data with name, email and address"""
     print(f"get_employee_data_with_name({name})")
-    resp = [emp for emp in EMPLOYEES if emp["name"] == name]
-    return resp 
+    return _INDEX.get(name, [])
 
 if __name__ == "__main__":
     print(f"EMPLOYEES: {EMPLOYEES}")
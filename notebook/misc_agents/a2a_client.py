@@ -4,7 +4,7 @@ import argparse
 import asyncio
 import logging
 import json
-from typing import Optional, Any, Dict
+from typing import Optional, Any, AsyncIterator, Dict
 from uuid import uuid4
 
 import httpx
@@ -27,120 +27,180 @@ def create_message(*, role: Role = Role.user, text: str) -> Message:
     )
 
 
-def _to_dict(obj):
-    if hasattr(obj, "model_dump"):
-        return obj.model_dump(exclude_none=True)
-    if isinstance(obj, dict):
-        return obj
-    # fallback best-effort
-    return {k: getattr(obj, k) for k in dir(obj) if not k.startswith("_")}
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_text(obj: Any) -> str:
+    try:
+        return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+    except Exception:
+        return str(obj)
+
+
+def _get(obj, key: str):
+    # typed A2A objects are read by attribute, raw HTTP payloads by key
+    return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
 
 
 def _text_from_parts(parts) -> str:
     out: list[str] = []
     for p in parts or []:
-        pd = p.model_dump(exclude_none=True) if hasattr(p, "model_dump") else (p if isinstance(p, dict) else None)
-        if not isinstance(pd, dict):
+        root = getattr(p, "root", p)  # Part is a RootModel over TextPart/FilePart/DataPart
+        if isinstance(root, TextPart):
+            if root.text:
+                out.append(root.text)
             continue
-        kind = pd.get("kind")
-        if kind == "text" and pd.get("text"):
-            out.append(pd["text"])
-        elif kind == "json" and pd.get("json") is not None:
-            try:
-                out.append(json.dumps(pd["json"]))
-            except Exception:
-                out.append(str(pd["json"]))
+        kind = _get(root, "kind")
+        if kind == "text":
+            text = _get(root, "text")
+            if text:
+                out.append(text)
+        elif kind == "json":
+            payload = _get(root, "json")
+            if payload is not None:
+                out.append(_json_text(payload))
     return "".join(out).strip()
 
 
 def extract_text_from_message(msg: Message) -> Optional[str]:
-    md = _to_dict(msg)
-    return _text_from_parts(md.get("parts", [])) or None
+    return _text_from_parts(_get(msg, "parts")) or None
 
 
 def extract_text_from_task(task) -> Optional[str]:
-    td = _to_dict(task)
     # Prefer artifacts[name=agent_response]
-    artifacts = td.get("artifacts") or []
+    artifacts = _get(task, "artifacts") or []
     chosen = None
     for a in artifacts:
-        ad = a if isinstance(a, dict) else _to_dict(a)
-        if ad.get("name") == "agent_response":
-            chosen = ad
+        if _get(a, "name") == "agent_response":
+            chosen = a
             break
     if chosen is None and artifacts:
-        last = artifacts[-1]
-        chosen = last if isinstance(last, dict) else _to_dict(last)
-    if chosen:
-        text = _text_from_parts(chosen.get("parts", []))
+        chosen = artifacts[-1]
+    if chosen is not None:
+        text = _text_from_parts(_get(chosen, "parts"))
         if text:
             return text
     # Fallback: try history last agent message
-    history = td.get("history") or []
+    history = _get(task, "history") or []
     for item in reversed(history):
-        id_ = item if isinstance(item, dict) else _to_dict(item)
-        if id_.get("role") == "agent":
-            text = _text_from_parts(id_.get("parts", []))
+        if _get(item, "role") == "agent":
+            text = _text_from_parts(_get(item, "parts"))
             if text:
                 return text
     return None
 
 
-async def send_message(message: str, base_url: str, streaming: bool = False) -> Optional[str]:
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
-        # Resolve agent card
-        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
-        agent_card = await resolver.get_agent_card()
-
-        # Create client
-        config = ClientConfig(httpx_client=httpx_client, streaming=streaming)
-        client = None
-        try:
-            client = ClientFactory(config).create(agent_card)
-        except Exception as e:
-            logger.info("No compatible JSON-RPC transport; falling back to HTTP. (%s)", e)
-
-        # Send
-        msg = create_message(text=message)
-        if client is not None:
-            text_out: list[str] = []
-            async for event in client.send_message(msg):
-                if isinstance(event, Message):
-                    text = extract_text_from_message(event)
-                    if text:
-                        text_out.append(text)
-                elif isinstance(event, tuple) and len(event) == 2:
-                    task, _update = event
-                    text = extract_text_from_task(task)
-                    if text:
-                        text_out.append(text)
-                else:
-                    # Try generic extraction from unknown payloads
+# base URL -> resolved agent card, so repeat sends skip the discovery round trip
+_AGENT_CARDS: Dict[str, Any] = {}
+
+
+async def _get_agent_card(httpx_client: httpx.AsyncClient, base_url: str):
+    card = _AGENT_CARDS.get(base_url)
+    if card is None:
+        card = _AGENT_CARDS[base_url] = await A2ACardResolver(
+            httpx_client=httpx_client, base_url=base_url
+        ).get_agent_card()
+    return card
+
+
+async def stream_message(
+    message: str,
+    base_url: str,
+    streaming: bool = False,
+    httpx_client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[str]:
+    """Send one text message to the agent at ``base_url`` and yield its text as it arrives.
+
+    Pass a long-lived ``httpx_client`` to reuse its connection pool across
+    calls; without one a client is opened and closed for this call only.
+    """
+    if httpx_client is None:
+        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as own_client:
+            async for chunk in _stream_message(message, base_url, streaming, own_client):
+                yield chunk
+        return
+    async for chunk in _stream_message(message, base_url, streaming, httpx_client):
+        yield chunk
+
+
+async def send_message(
+    message: str,
+    base_url: str,
+    streaming: bool = False,
+    httpx_client: Optional[httpx.AsyncClient] = None,
+) -> Optional[str]:
+    """Like :func:`stream_message`, but return the whole reply as one string (or None)."""
+    text_out = [chunk async for chunk in stream_message(message, base_url, streaming, httpx_client)]
+    return "".join(text_out) if text_out else None
+
+
+async def _stream_message(
+    message: str, base_url: str, streaming: bool, httpx_client: httpx.AsyncClient
+) -> AsyncIterator[str]:
+    # Resolve (or reuse) the agent card
+    agent_card = await _get_agent_card(httpx_client, base_url)
+
+    # Create client
+    config = ClientConfig(httpx_client=httpx_client, streaming=streaming)
+    client = None
+    try:
+        client = ClientFactory(config).create(agent_card)
+    except Exception as e:
+        logger.info("No compatible JSON-RPC transport; falling back to HTTP. (%s)", e)
+
+    # Send
+    msg = create_message(text=message)
+    if client is not None:
+        async for event in client.send_message(msg):
+            if isinstance(event, Message):
+                text = extract_text_from_message(event)
+            elif isinstance(event, tuple) and len(event) == 2:
+                task, _update = event
+                text = extract_text_from_task(task)
+            else:
+                # Try generic extraction from unknown payloads
+                try:
+                    text = extract_text_from_message(event)  # type: ignore[arg-type]
+                except Exception:
+                    text = None
+                if not text:
                     try:
-                        text = extract_text_from_message(event)  # type: ignore[arg-type]
+                        text = extract_text_from_task(event)  # type: ignore[arg-type]
                     except Exception:
                         text = None
-                    if not text:
-                        try:
-                            text = extract_text_from_task(event)  # type: ignore[arg-type]
-                        except Exception:
-                            text = None
-                    if text:
-                        text_out.append(text)
-            return "".join(text_out) if text_out else None
-
-        # HTTP fallback for agents that expose /a2a/messages (non-JSONRPC)
-        http_payload: Dict[str, Any] = {
-            "kind": "message",
-            "role": "user",
-            "parts": [{"kind": "text", "text": message}],
-        }
-        r = await httpx_client.post(base_url.rstrip("/") + "/a2a/messages", json=http_payload)
-        r.raise_for_status()
-        resp = r.json()
-        if isinstance(resp, dict) and resp.get("kind") == "message":
-            return _text_from_parts(resp.get("parts", [])) or None
-        return json.dumps(resp)
+            if text:
+                yield text
+        return
+
+    # HTTP fallback for agents that expose /a2a/messages (non-JSONRPC)
+    http_payload: Dict[str, Any] = {
+        "kind": "message",
+        "role": "user",
+        "parts": [{"kind": "text", "text": message}],
+    }
+    r = await httpx_client.post(base_url.rstrip("/") + "/a2a/messages", json=http_payload)
+    r.raise_for_status()
+    resp = r.json()
+    if isinstance(resp, dict) and resp.get("kind") == "message":
+        text = _text_from_parts(resp.get("parts", []))
+        if text:
+            yield text
+        return
+    yield json.dumps(resp)
+
+
+async def _print_stream(message: str, base_url: str, streaming: bool) -> None:
+    printed = False
+    async for chunk in stream_message(message, base_url, streaming):
+        print(chunk, end="", flush=True)
+        printed = True
+    if printed:
+        print()
+    else:
+        print("<no text response>")
 
 
 def main():
@@ -150,11 +210,7 @@ def main():
     parser.add_argument("--stream", action="store_true", help="Enable client streaming mode")
     args = parser.parse_args()
 
-    out = asyncio.run(send_message(args.message, args.base_url, args.stream))
-    if out:
-        print(out)
-    else:
-        print("<no text response>")
+    asyncio.run(_print_stream(args.message, args.base_url, args.stream))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import logging
 import os
 import json
-import uuid
+import time
+import itertools
+import secrets
+import weakref
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -16,10 +21,29 @@ from strands_tools.a2a_client import A2AClientToolProvider
 import asyncio
 import httpx
 from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
-from a2a.types import Message as A2AMessage, Part as A2APart, Role as A2ARole, TextPart as A2ATextPart
-import uuid
+from a2a.types import AgentCard, Message as A2AMessage, Part as A2APart, Role as A2ARole, TextPart as A2ATextPart
 load_dotenv()
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_text(obj) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+
+# Correlation / message ids: random per-process prefix + counter, unique
+# without a urandom read and UUID object per request
+_ID_PREFIX = secrets.token_hex(8)
+_ID_COUNTER = itertools.count(1)
+
+
+def fast_id() -> str:
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):016x}"
+
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -28,6 +52,48 @@ logger = logging.getLogger(__name__)
 PROFILE_AGENT_URL = os.getenv("PROFILE_AGENT_URL", "http://127.0.0.1:9004/")
 
 
+# Resolved agent cards are cached on disk so a fresh process skips the
+# /.well-known/agent-card.json round trip while the entry is fresh
+A2A_CARD_CACHE_DIR = Path(os.getenv("A2A_CARD_CACHE_DIR", Path.home() / ".cache" / "a2a"))
+A2A_CARD_TTL_S = float(os.getenv("A2A_CARD_TTL_S", "3600"))
+
+
+def _card_cache_path(url: str) -> Path:
+    return A2A_CARD_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def _load_cached_card(url: str) -> AgentCard | None:
+    """Return the cached card for `url`, or None when missing, stale or unreadable."""
+    try:
+        entry = json.loads(_card_cache_path(url).read_text())
+        if entry["expires"] <= time.time():
+            return None
+        return AgentCard.model_validate(entry["card"])
+    except Exception:
+        return None
+
+
+def _drop_cached_card(url: str) -> None:
+    try:
+        _card_cache_path(url).unlink(missing_ok=True)
+    except OSError as e:
+        logger.info("Could not drop cached agent card for %s: %s", url, e)
+
+
+async def _fetch_and_store_card(url: str, httpx_client: httpx.AsyncClient) -> AgentCard:
+    card = await A2ACardResolver(httpx_client=httpx_client, base_url=url).get_agent_card()
+    entry = {
+        "expires": time.time() + A2A_CARD_TTL_S,
+        "card": card.model_dump(mode="json", by_alias=True, exclude_none=True),
+    }
+    try:
+        A2A_CARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _card_cache_path(url).write_text(json.dumps(entry))
+    except OSError as e:
+        logger.info("Could not cache agent card for %s: %s", url, e)
+    return card
+
+
 ORCHESTRATOR_SYSTEM = (
     "You are the Orchestrator Agent. You have one tool 'call_profile_agent' that calls the remote Profile A2A agent. "
     "For profile-related requests (email, address, preferences), ALWAYS call this tool with the user's question and "
@@ -36,9 +102,9 @@ ORCHESTRATOR_SYSTEM = (
 
 
 class A2AAgentTool:
-    """Wrap a remote A2A agent as a Strands tool with pre-resolved agent card.
+    """Wrap a remote A2A agent as a Strands tool with a lazily resolved agent card.
 
-    - Avoids repeated discovery calls by caching the agent card at init.
+    - Avoids repeated discovery calls by resolving the agent card once, on first use.
     - Supports both JSONRPC and HTTP transports based on the card's preferredTransport.
     - Returns the remote agent's structured JSON/text exactly as provided.
     """
@@ -48,16 +114,31 @@ class A2AAgentTool:
         self.agent_name = agent_name
         self.agent_card = None
         self.preferred_transport = "JSONRPC"
-        # Resolve once (async) and cache the card
-        self._resolve_card()
+        # Long-lived client per event loop (created on first call inside it) so
+        # repeat calls reuse pooled keep-alive connections. Pooled connections
+        # belong to the loop that opened them, and a Strands Agent runs each
+        # agent(...) call on a fresh loop, so clients are never shared across
+        # loops; entries go away with their loop.
+        self._http: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        # Card is resolved lazily on first call (see _ensure_card), so the tool
+        # can be built inside a running event loop
+        self._card_lock = asyncio.Lock()
 
-    def _resolve_card(self):
-        async def _resolve(url: str):
-            async with httpx.AsyncClient(timeout=15) as httpx_client:
-                resolver = A2ACardResolver(httpx_client=httpx_client, base_url=url)
-                return await resolver.get_agent_card()
+    async def _ensure_card(self) -> None:
+        """Resolve the agent card once per tool: disk cache first, then the network."""
+        if self.agent_card is not None:
+            return
+        async with self._card_lock:
+            if self.agent_card is not None:  # resolved while we waited
+                return
+            card = _load_cached_card(self.agent_url)
+            if card is None:
+                card = await _fetch_and_store_card(self.agent_url, await self._client())
+            self._set_card(card)
 
-        card = asyncio.run(_resolve(self.agent_url))
+    def _set_card(self, card) -> None:
         # Cache raw card and preferred transport
         self.agent_card = card
         pt = None
@@ -70,6 +151,28 @@ class A2AAgentTool:
             pt = getattr(card, "preferred_transport", None) or getattr(card, "preferredTransport", None)
         self.preferred_transport = (pt or "JSONRPC").upper()
 
+    async def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._http.get(loop)
+        if client is None:
+            client = self._http[loop] = httpx.AsyncClient(
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            )
+        return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's client (others can only be closed on their own loop)."""
+        client = self._http.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> "A2AAgentTool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def _parts_to_text(self, parts) -> str:
         out: list[str] = []
         for p in parts or []:
@@ -78,18 +181,33 @@ class A2AAgentTool:
                 if kind == "text" and p.get("text"):
                     out.append(p["text"])
                 elif kind == "json" and p.get("json") is not None:
-                    out.append(json.dumps(p["json"]))
+                    out.append(_json_text(p["json"]))
             else:
-                # a2a types
-                try:
-                    pd = p.model_dump(exclude_none=True)
-                except Exception:
-                    pd = {}
-                kind = pd.get("kind")
-                if kind == "text" and pd.get("text"):
-                    out.append(pd["text"])
-                elif kind == "json" and pd.get("json") is not None:
-                    out.append(json.dumps(pd["json"]))
+                # a2a types: Part is a RootModel over TextPart/FilePart/DataPart,
+                # so read attributes off the root instead of dumping the model
+                root = getattr(p, "root", p)
+                if isinstance(root, A2ATextPart):
+                    if root.text:
+                        out.append(root.text)
+                    continue
+                kind = getattr(root, "kind", None)
+                if kind is None:
+                    try:
+                        pd = root.model_dump(exclude_none=True)
+                    except Exception:
+                        pd = {}
+                    kind, text, json_val = pd.get("kind"), pd.get("text"), pd.get("json")
+                else:
+                    text, json_val = getattr(root, "text", None), getattr(root, "json", None)
+                if kind == "text" and text:
+                    out.append(text)
+                elif kind == "json" and json_val is not None:
+                    out.append(_json_text(json_val))
+        # Replies are usually a single part: skip the join for that case. A list
+        # + join stays the accumulator otherwise (cheaper for str than a bytearray,
+        # which would need an encode per text part and a decode at the end)
+        if len(out) == 1:
+            return out[0].strip()
         return "\n".join(out).strip()
 
     async def _call_http(self, message: str) -> str:
@@ -98,66 +216,77 @@ class A2AAgentTool:
             "role": "user",
             "parts": [{"kind": "text", "text": message}],
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.post(self.agent_url + "a2a/messages", json=payload)
-            r.raise_for_status()
-            data = r.json()
-            if isinstance(data, dict) and data.get("kind") == "message":
-                return self._parts_to_text(data.get("parts", []))
-            return json.dumps(data)
+        client = await self._client()
+        r = await client.post(self.agent_url + "a2a/messages", json=payload)
+        r.raise_for_status()
+        data = r.json()
+        if isinstance(data, dict) and data.get("kind") == "message":
+            return self._parts_to_text(data.get("parts", []))
+        return json.dumps(data)
 
     async def _call_jsonrpc(self, message: str) -> str:
-        async with httpx.AsyncClient(timeout=30) as httpx_client:
-            config = ClientConfig(httpx_client=httpx_client, streaming=False)
-            client = ClientFactory(config).create(self.agent_card)
-
-            msg = A2AMessage(
-                kind="message",
-                role=A2ARole.user,
-                parts=[A2APart(A2ATextPart(kind="text", text=message))],
-                message_id=uuid.uuid4().hex,
-            )
+        httpx_client = await self._client()
+        config = ClientConfig(httpx_client=httpx_client, streaming=False)
+        client = ClientFactory(config).create(self.agent_card)
+
+        msg = A2AMessage(
+            kind="message",
+            role=A2ARole.user,
+            parts=[A2APart(A2ATextPart(kind="text", text=message))],
+            message_id=fast_id(),
+        )
 
-            async for event in client.send_message(msg):
-                # Message
+        async for event in client.send_message(msg):
+            # Message
+            try:
+                from a2a.types import Message as _Msg
+                if isinstance(event, _Msg):
+                    return self._parts_to_text(event.parts)
+            except Exception:
+                pass
+            # Task + UpdateEvent
+            if isinstance(event, tuple) and len(event) == 2:
+                task, _ = event
                 try:
-                    from a2a.types import Message as _Msg
-                    if isinstance(event, _Msg):
-                        return self._parts_to_text(event.parts)
+                    td = task.model_dump(exclude_none=True)
                 except Exception:
-                    pass
-                # Task + UpdateEvent
-                if isinstance(event, tuple) and len(event) == 2:
-                    task, _ = event
-                    try:
-                        td = task.model_dump(exclude_none=True)
-                    except Exception:
-                        td = {}
-                    artifacts = td.get("artifacts") or []
-                    chosen = None
-                    for a in artifacts:
-                        if isinstance(a, dict) and a.get("name") == "agent_response":
-                            chosen = a
-                            break
-                    if chosen is None and artifacts and isinstance(artifacts[-1], dict):
-                        chosen = artifacts[-1]
-                    if chosen:
-                        return self._parts_to_text(chosen.get("parts", []))
-                    # Fallback: history
-                    for item in reversed(td.get("history") or []):
-                        if isinstance(item, dict) and item.get("role") == "agent":
-                            return self._parts_to_text(item.get("parts", []))
-            return ""
+                    td = {}
+                artifacts = td.get("artifacts") or []
+                by_name = {a.get("name"): a for a in artifacts if isinstance(a, dict)}
+                chosen = by_name.get("agent_response") or (
+                    artifacts[-1] if artifacts and isinstance(artifacts[-1], dict) else None
+                )
+                if chosen:
+                    return self._parts_to_text(chosen.get("parts", []))
+                # Fallback: latest agent message in history
+                history = td.get("history") or []
+                agent_item = next(
+                    (item for item in reversed(history) if isinstance(item, dict) and item.get("role") == "agent"),
+                    None,
+                )
+                if agent_item is not None:
+                    return self._parts_to_text(agent_item.get("parts", []))
+        return ""
 
     async def invoke(self, message: str) -> str:
         """Programmatic invocation that returns the remote agent's raw output."""
         try:
+            await self._ensure_card()
             if self.preferred_transport == "HTTP":
                 return await self._call_http(message)
             return await self._call_jsonrpc(message)
         except Exception as e:
+            # The card may be stale (agent moved or switched transport): forget
+            # it so the next call resolves it again instead of failing until
+            # the cache entry expires
+            self._forget_card()
             return f"Error contacting {self.agent_name}: {str(e)}"
 
+    def _forget_card(self) -> None:
+        self.agent_card = None
+        self.preferred_transport = "JSONRPC"
+        _drop_cached_card(self.agent_url)
+
     @tool
     async def call_profile_agent(self, message: str) -> str:
         """Tool entrypoint that proxies to invoke()."""
@@ -174,7 +303,7 @@ def build_agent(profile_agent_url: str) -> Agent:
         params={"temperature": 0},
     )
 
-    # Pre-resolve and wrap the target agent as a tool
+    # Wrap the target agent as a tool; its card is resolved on the first call
     a2a_tool = A2AAgentTool(profile_agent_url, agent_name="Profile Agent")
 
     return Agent(
@@ -187,6 +316,11 @@ def build_agent(profile_agent_url: str) -> Agent:
     )
 
 
+async def _run(tool_wrapper: A2AAgentTool, question: str) -> str:
+    async with tool_wrapper:
+        return await tool_wrapper.invoke(question)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Orchestrator Agent that calls Profile A2A agent via tools")
     parser.add_argument(
@@ -197,9 +331,10 @@ def main():
     )
     args = parser.parse_args()
 
-    # Direct tool invocation to ensure exact structured output (no LLM paraphrase)
+    # Direct tool invocation to ensure exact structured output (no LLM paraphrase);
+    # no Agent is built, so this is the only A2AAgentTool and card resolution
     tool_wrapper = A2AAgentTool(PROFILE_AGENT_URL, agent_name="Profile Agent")
-    response = asyncio.run(tool_wrapper.invoke(args.question))
+    response = asyncio.run(_run(tool_wrapper, args.question))
     logger.info("Response: %s", response)
     print(response)
 
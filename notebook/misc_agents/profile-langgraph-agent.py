@@ -27,19 +27,48 @@ Extension points
 
 import os
 import re
+import asyncio
 import time
-import uuid
+import itertools
+import secrets
 import json
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
 load_dotenv()
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Correlation / message ids: random per-process prefix + counter, unique
+# without a urandom read and UUID object per request
+_ID_PREFIX = secrets.token_hex(8)
+_ID_COUNTER = itertools.count(1)
+
+
+def fast_id() -> str:
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):016x}"
+
+
 # Optional integration with your existing LangGraph handler(s)
 try:
     from agents.profile_agent_lg import handle_request_async as HANDLE_REQUEST_ASYNC  # type: ignore
@@ -51,7 +80,7 @@ except Exception:
     HANDLE_REQUEST = None
 
 
-# ----- Structured profile schema -----
+# ----- Structured profile schema (shape of the static payload in run_langgraph_flow) -----
 class NameValue(BaseModel):
     name: str
     value: str
@@ -66,13 +95,36 @@ class ProfileResponse(BaseModel):
     data: ProfileData
 
 
+_MEMBER_ID_RE = re.compile(r"\b(\d{6,})\b")
+
+
 def extract_member_id(text: str) -> str:
     """Extract 6+ digit member id from free‑form text (robust parsing)."""
-    m = re.search(r"\b(\d{6,})\b", text or "")
+    m = _MEMBER_ID_RE.search(text or "")
     return m.group(1) if m else "378477398"
 
 
-async def run_langgraph_flow(query: str, member_id: str) -> Dict[str, Any]:
+@lru_cache(maxsize=1024)
+def _static_profile(member_id: str) -> Dict[str, Any]:
+    """Stub payload (ProfileResponse shape), built once per member_id.
+
+    Shared between calls, so callers must treat it as read-only.
+    """
+    return {
+        "data": {
+            "address": [
+                {"name": "Address Line 1: ", "value": "123 Main St"},
+                {"name": "City: ", "value": "Anytown"},
+                {"name": "StateCd: ", "value": "VA"},
+                {"name": "CountryCd: ", "value": "USA"},
+                {"name": "ZipCd: ", "value": "230123"},
+            ],
+            "email": [{"name": "Email: ", "value": f"{member_id}@gmail.com"}],
+        }
+    }
+
+
+async def _run_handlers(query: str, member_id: str) -> Dict[str, Any]:
     """Run your LangGraph flow if available; else return a static stub."""
     # Prefer async handler
     if HANDLE_REQUEST_ASYNC:
@@ -89,22 +141,56 @@ async def run_langgraph_flow(query: str, member_id: str) -> Dict[str, Any]:
         except Exception:
             pass
     # Static fallback
-    return ProfileResponse(
-        data=ProfileData(
-            address=[
-                NameValue(name="Address Line 1: ", value="123 Main St"),
-                NameValue(name="City: ", value="Anytown"),
-                NameValue(name="StateCd: ", value="VA"),
-                NameValue(name="CountryCd: ", value="USA"),
-                NameValue(name="ZipCd: ", value="230123"),
-            ],
-            email=[NameValue(name="Email: ", value=f"{member_id}@gmail.com")],
-        )
-    ).model_dump(exclude_none=True)
+    return _static_profile(member_id)
+
+
+# Handler results are stable for minutes, so they are cached per
+# (member_id, normalized query) for PAYLOAD_CACHE_TTL_S, LRU-bounded
+PAYLOAD_CACHE_TTL_S = float(os.getenv("PAYLOAD_CACHE_TTL_S", "60"))
+PAYLOAD_CACHE_MAX = 4096
+_PAYLOAD_CACHE: OrderedDict[tuple[str, str], tuple[float, Dict[str, Any]]] = OrderedDict()
+# Single-flight: the first miss for a key runs the handlers in a task, and every
+# concurrent caller for that key (the first included) awaits it shielded, so a
+# cancelled caller never cancels the run the others are waiting on
+_PAYLOAD_IN_FLIGHT: Dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _store_payload(key: tuple[str, str], task: asyncio.Task) -> None:
+    _PAYLOAD_IN_FLIGHT.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _PAYLOAD_CACHE[key] = (time.monotonic() + PAYLOAD_CACHE_TTL_S, task.result())
+    _PAYLOAD_CACHE.move_to_end(key)
+    if len(_PAYLOAD_CACHE) > PAYLOAD_CACHE_MAX:
+        _PAYLOAD_CACHE.popitem(last=False)
+
+
+async def run_langgraph_flow(query: str, member_id: str) -> Dict[str, Any]:
+    """Cached _run_handlers; the result is shared, so callers must treat it as read-only."""
+    if HANDLE_REQUEST_ASYNC is None and HANDLE_REQUEST is None:
+        return _static_profile(member_id)  # already memoized, nothing to run
+
+    key = (member_id, (query or "").strip().lower())
+    hit = _PAYLOAD_CACHE.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        _PAYLOAD_CACHE.move_to_end(key)
+        return hit[1]
+    task = _PAYLOAD_IN_FLIGHT.get(key)
+    if task is None:
+        # the dict holds the strong reference until the task finishes
+        task = _PAYLOAD_IN_FLIGHT[key] = asyncio.create_task(_run_handlers(query, member_id))
+        task.add_done_callback(lambda t: _store_payload(key, t))
+    return await asyncio.shield(task)
 
 
 # ----- FastAPI app (no Strands) -----
-app = FastAPI(title="Profile LangGraph Agent", version="0.1.0")
+# Handlers return dicts already in their final shape: encode them with orjson
+# when available, and declare response_model=None so FastAPI skips validating them
+app = FastAPI(
+    title="Profile LangGraph Agent",
+    version="0.1.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -115,66 +201,97 @@ app.add_middleware(
 )
 
 API_KEY = os.getenv("PROFILE_LG_AGENT_API_KEY", "dev-key")
+_API_KEY_B = API_KEY.encode()
+_PROTECTED = ("/healthz", "/version")
 
 
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-    request.state.request_id = req_id
-    response: Response = await call_next(request)
-    response.headers["X-Request-ID"] = req_id
-    return response
+class EdgeMiddleware:
+    """Request ID, API-key gate and timing header as one pure ASGI layer.
 
+    Replaces three ``@app.middleware("http")`` layers; headers are read once
+    from the raw scope instead of through Starlette's ``Headers`` per layer.
+    """
 
-@app.middleware("http")
-async def protect_custom_routes(request: Request, call_next):
-    protected = ("/healthz", "/version")
-    if request.url.path in protected:
-        key = request.headers.get("x-api-key") or request.headers.get("X-API-Key")
-        if not key or key != API_KEY:
-            raise HTTPException(status_code=401, detail="Invalid or missing API key")
-    return await call_next(request)
+    def __init__(self, app) -> None:
+        self.app = app
 
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-@app.middleware("http")
-async def timing_header(request: Request, call_next):
-    start = time.perf_counter()
-    response = await call_next(request)
-    response.headers["X-Process-Time"] = f"{(time.perf_counter() - start)*1000:.2f}ms"
-    return response
+        start = time.perf_counter()
+        hdrs = dict(scope["headers"])  # header names are lower-case bytes
+        req_id = hdrs.get(b"x-request-id") or fast_id().encode()
+        scope.setdefault("state", {})["request_id"] = req_id.decode("latin-1")
 
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                process_ms = (time.perf_counter() - start) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", req_id),
+                    (b"x-process-time", b"%.2fms" % process_ms),
+                ]
+            await send(message)
 
-# HTTP‑style (non‑JSONRPC) A2A endpoints
-class TextPart(BaseModel):
-    kind: str = "text"
-    text: Optional[str] = None
+        if scope["path"] in _PROTECTED and hdrs.get(b"x-api-key") != _API_KEY_B:
+            response = JSONResponse({"detail": "Invalid or missing API key"}, status_code=401)
+            await response(scope, receive, send_with_headers)
+            return
+        await self.app(scope, receive, send_with_headers)
 
 
-class Message(BaseModel):
-    kind: str = "message"
-    role: str
-    parts: List[TextPart]
+app.add_middleware(EdgeMiddleware)
 
 
-def _first_text(parts: List[TextPart]) -> str:
+# HTTP‑style (non‑JSONRPC) A2A endpoints
+def _first_text(parts: Any) -> str:
     for p in parts or []:
-        if p.kind == "text" and p.text:
-            return p.text
+        if isinstance(p, dict) and p.get("kind", "text") == "text" and p.get("text"):
+            return p["text"]
     return ""
 
 
-@app.get("/healthz")
-def healthz():
-    return {"status": "ok", "service": "profile-langgraph-agent"}
+# Constant payloads, encoded once; async handlers also skip the threadpool hop
+# sync routes take. The card is static, so clients may cache it for an hour.
+AGENT_CARD_TTL_S = 3600
+_HEALTHZ_JSON = b'{"status":"ok","service":"profile-langgraph-agent"}'
+_VERSION_JSON = b'{"version":"0.1.0","agent":"Profile LangGraph Agent"}'
+_AGENT_CARD_BYTES = _json_dumps({
+    "capabilities": {"streaming": False},
+    "defaultInputModes": ["text"],
+    "defaultOutputModes": ["text"],
+    "description": "Profile overview via LangGraph; returns structured JSON",
+    "name": "Profile LangGraph Agent",
+    "preferredTransport": "HTTP",
+    "protocolVersion": "0.3.0",
+    "skills": [
+        {
+            "id": "get_profile_overview",
+            "name": "get_profile_overview",
+            "description": "Structured profile (email+address)",
+            "tags": [],
+        }
+    ],
+    "url": "http://127.0.0.1:9004/",
+    "version": "0.0.1",
+})
+_AGENT_CARD_HEADERS = {"Cache-Control": f"public, max-age={AGENT_CARD_TTL_S}"}
+
+
+@app.api_route("/healthz", methods=["GET", "HEAD"])
+async def healthz():
+    return Response(content=_HEALTHZ_JSON, media_type="application/json")
 
 
 @app.get("/version")
-def version():
-    return {"version": "0.1.0", "agent": "Profile LangGraph Agent"}
+async def version():
+    return Response(content=_VERSION_JSON, media_type="application/json")
 
 
 @app.get("/.well-known/agent-card.json")
-def agent_card():
+async def agent_card():
     """A minimal agent card to enable discovery by A2A clients.
 
     Key fields
@@ -182,36 +299,26 @@ def agent_card():
     - skills: purely informative in this HTTP example; Strands/A2A SDKs will
       primarily look at the transport and URL when using this card.
     """
-    return {
-        "capabilities": {"streaming": False},
-        "defaultInputModes": ["text"],
-        "defaultOutputModes": ["text"],
-        "description": "Profile overview via LangGraph; returns structured JSON",
-        "name": "Profile LangGraph Agent",
-        "preferredTransport": "HTTP",
-        "protocolVersion": "0.3.0",
-        "skills": [
-            {
-                "id": "get_profile_overview",
-                "name": "get_profile_overview",
-                "description": "Structured profile (email+address)",
-                "tags": [],
-            }
-        ],
-        "url": "http://127.0.0.1:9004/",
-        "version": "0.0.1",
-    }
+    return Response(content=_AGENT_CARD_BYTES, media_type="application/json", headers=_AGENT_CARD_HEADERS)
 
 
-@app.post("/a2a/messages")
-async def a2a_messages(msg: Message) -> Dict[str, Any]:
+@app.post("/a2a/messages", response_model=None)
+async def a2a_messages(request: Request) -> Dict[str, Any]:
     """HTTP transport messaging endpoint.
 
     Accepts an A2A `Message` (no JSON‑RPC envelope) and returns an A2A `Message`
     with a text part (tool name) and a json part (structured payload). The
     orchestrator uses the `json` part for the final structured response.
     """
-    query = _first_text(msg.parts)
+    # Read as raw JSON rather than validated into pydantic models per request;
+    # the checks below keep the old contract (an object with a role and parts)
+    try:
+        msg = _json_loads(await request.body())
+    except ValueError:
+        msg = None
+    if not (isinstance(msg, dict) and isinstance(msg.get("role"), str) and isinstance(msg.get("parts"), list)):
+        raise HTTPException(status_code=400, detail="Body must be a JSON A2A message with 'role' and 'parts'")
+    query = _first_text(msg["parts"])
     member_id = extract_member_id(query)
     payload = await run_langgraph_flow(query=query, member_id=member_id)
     return {
@@ -224,17 +331,35 @@ async def a2a_messages(msg: Message) -> Dict[str, Any]:
     }
 
 
-class Query(BaseModel):
-    question: str
-
-
-@app.post("/query")
-async def query_endpoint(body: Query) -> Dict[str, Any]:
+@app.post("/query", response_model=None)
+async def query_endpoint(request: Request) -> Dict[str, Any]:
     """Convenience endpoint for direct programmatic calls (non‑A2A)."""
-    member_id = extract_member_id(body.question)
-    payload = await run_langgraph_flow(query=body.question, member_id=member_id)
+    try:
+        body = _json_loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON with a 'question' string")
+    question = body.get("question") if isinstance(body, dict) else None
+    if not isinstance(question, str):
+        raise HTTPException(status_code=400, detail="Body must be JSON with a 'question' string")
+    member_id = extract_member_id(question)
+    payload = await run_langgraph_flow(query=question, member_id=member_id)
     return payload
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=9004)
+    # uvicorn picks uvloop and httptools on its own when they are installed;
+    # per-request access logging is off to keep it out of the hot path.
+    # Requests share no mutable state, so PROFILE_AGENT_WORKERS can fan out to processes.
+    workers = int(os.getenv("PROFILE_AGENT_WORKERS", "1"))
+    if workers > 1:
+        # multiple workers need an import string rather than the app object
+        uvicorn.run(
+            f"{os.path.splitext(os.path.basename(__file__))[0]}:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host="0.0.0.0",
+            port=9004,
+            workers=workers,
+            access_log=False,
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=9004, access_log=False)
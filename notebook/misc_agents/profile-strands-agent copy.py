@@ -3,13 +3,15 @@ from __future__ import annotations
 import os
 import re
 import time
-import uuid
-from typing import List
+import itertools
+import secrets
+from typing import Any, List
 import json
 
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import Request, Response, HTTPException
+from fastapi import Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -18,8 +20,32 @@ from strands.multiagent.a2a import A2AServer
 
 load_dotenv()
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Correlation / message ids: random per-process prefix + counter, unique
+# without a urandom read and UUID object per request
+_ID_PREFIX = secrets.token_hex(8)
+_ID_COUNTER = itertools.count(1)
+
 
-# ----- Structured profile schema -----
+def fast_id() -> str:
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):016x}"
+
+
+# ----- Structured profile schema (shape of the payload built in get_profile_overview) -----
 class NameValue(BaseModel):
     name: str
     value: str
@@ -34,8 +60,11 @@ class ProfileResponse(BaseModel):
     data: ProfileData
 
 
+_MEMBER_ID_RE = re.compile(r"\b(\d{6,})\b")
+
+
 def extract_member_id(text: str) -> str:
-    m = re.search(r"\b(\d{6,})\b", text or "")
+    m = _MEMBER_ID_RE.search(text or "")
     return m.group(1) if m else "378477398"
 
 
@@ -46,6 +75,33 @@ except Exception:
     HANDLE_REQUEST = None
 
 
+# ----- Static stub payload -----
+# Only the email depends on member_id, so the JSON (ProfileResponse shape) is
+# encoded once with a placeholder and filled in per call.
+_MID_SLOT = "__MID__"
+_STATIC_PROFILE_TEMPLATE = _json_dumps({
+    "data": {
+        "address": [
+            {"name": "Address Line 1: ", "value": "123 Main St"},
+            {"name": "City: ", "value": "Richmond"},
+            {"name": "StateCd: ", "value": "VA"},
+            {"name": "CountryCd: ", "value": "USA"},
+            {"name": "ZipCd: ", "value": "230123"},
+        ],
+        "email": [{"name": "Email: ", "value": f"{_MID_SLOT}@gmail.com"}],
+    }
+}).decode()
+_DEFAULT_PROFILE_JSON = _STATIC_PROFILE_TEMPLATE.replace(_MID_SLOT, "378477398")
+
+
+def _static_profile_json(member_id: str) -> str:
+    if member_id == "378477398":
+        return _DEFAULT_PROFILE_JSON
+    if member_id.isdigit():  # nothing to escape, so a plain splice is valid JSON
+        return _STATIC_PROFILE_TEMPLATE.replace(_MID_SLOT, member_id)
+    return _STATIC_PROFILE_TEMPLATE.replace(_MID_SLOT, _json_dumps(member_id).decode()[1:-1])
+
+
 # ----- Tool: call existing logic when available, else stub -----
 @tool
 def get_profile_overview(member_id: str, query: str | None = None) -> str:
@@ -58,24 +114,30 @@ def get_profile_overview(member_id: str, query: str | None = None) -> str:
         try:
             _tool, payload = HANDLE_REQUEST(query=query or "", member_id=member_id)
             if isinstance(payload, (dict, list)):
-                return json.dumps(payload)
+                return _json_dumps(payload).decode()
             return str(payload)
         except Exception:
             pass
 
-    resp = ProfileResponse(
-        data=ProfileData(
-            address=[
-                NameValue(name="Address Line 1: ", value="123 Main St"),
-                NameValue(name="City: ", value="Richmond"),
-                NameValue(name="StateCd: ", value="VA"),
-                NameValue(name="CountryCd: ", value="USA"),
-                NameValue(name="ZipCd: ", value="230123"),
-            ],
-            email=[NameValue(name="Email: ", value=f"{member_id}@gmail.com")],
-        )
-    )
-    return resp.model_dump_json(exclude_none=True)
+    return _static_profile_json(member_id)
+
+
+# The fast path embeds the profile JSON as a JSON string value. The static payload
+# is plain ASCII, so its escaped form is also encoded once and only the member_id
+# is spliced in; digits need no escaping at either level.
+_STATIC_PROFILE_TEXT_TEMPLATE = _json_dumps(_STATIC_PROFILE_TEMPLATE)
+_MID_SLOT_B = _MID_SLOT.encode()
+_DEFAULT_PROFILE_TEXT = _STATIC_PROFILE_TEXT_TEMPLATE.replace(_MID_SLOT_B, b"378477398")
+
+
+def get_profile_overview_encoded(member_id: str, query: str | None = None) -> bytes:
+    """get_profile_overview's result, already encoded as a JSON string value."""
+    if HANDLE_REQUEST is None:
+        if member_id == "378477398":
+            return _DEFAULT_PROFILE_TEXT
+        if member_id.isdigit():
+            return _STATIC_PROFILE_TEXT_TEMPLATE.replace(_MID_SLOT_B, member_id.encode())
+    return _json_dumps(get_profile_overview(member_id=member_id, query=query))
 
 
 PROFILE_AGENT_SYSTEM = (
@@ -112,78 +174,143 @@ fastapi_app.add_middleware(
 )
 
 API_KEY = os.getenv("PROFILE_AGENT_API_KEY", "dev-key")
-
-
-@fastapi_app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    req_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-    request.state.request_id = req_id
-    response: Response = await call_next(request)
-    response.headers["X-Request-ID"] = req_id
-    return response
-
-
-@fastapi_app.middleware("http")
-async def protect_custom_routes(request: Request, call_next):
-    # Do NOT gate the A2A JSON-RPC root or agent-card; protect only our custom routes
-    protected = ("/healthz", "/version")
-    if request.url.path in protected:
-        key = request.headers.get("x-api-key") or request.headers.get("X-API-Key")
-        if not key or key != API_KEY:
-            raise HTTPException(status_code=401, detail="Invalid or missing API key")
-    return await call_next(request)
-
-
-@fastapi_app.middleware("http")
-async def timing_header(request: Request, call_next):
-    start = time.perf_counter()
-    response = await call_next(request)
-    response.headers["X-Process-Time"] = f"{(time.perf_counter() - start)*1000:.2f}ms"
-    return response
+_API_KEY_B = API_KEY.encode()
+# Do NOT gate the A2A JSON-RPC root or agent-card; protect only our custom routes
+_PROTECTED = ("/healthz", "/version")
 
 
 # ----- Fast-path JSON-RPC handler to bypass LLM for deterministic tool -----
-@fastapi_app.middleware("http")
-async def fast_a2a_message_send(request: Request, call_next):
-    # Intercept JSON-RPC message/send at root and answer directly via tool
-    if request.method == "POST" and request.url.path == "/":
-        try:
-            body = await request.body()
-            payload = json.loads(body or b"{}")
-            if (
-                isinstance(payload, dict)
-                and payload.get("jsonrpc") == "2.0"
-                and payload.get("method") in ("message/send", "message.send")
-            ):
-                params = payload.get("params") or {}
-                msg = params.get("message") or {}
-                parts = msg.get("parts") or []
-                text = ""
-                for p in parts:
-                    if isinstance(p, dict) and p.get("kind") == "text" and p.get("text"):
-                        text = p["text"]
-                        break
-
-                member_id = extract_member_id(text)
-                result_text = get_profile_overview(member_id=member_id, query=text)
-
-                reply = {
-                    "jsonrpc": "2.0",
-                    "id": payload.get("id"),
-                    "result": {
-                        "kind": "message",
-                        "role": "agent",
-                        "messageId": uuid.uuid4().hex,
-                        "parts": [
-                            {"kind": "text", "text": result_text}
-                        ],
-                    },
-                }
-                return Response(content=json.dumps(reply), media_type="application/json")
-        except Exception:
-            # On any parsing error, fall through to default handler
-            pass
-    return await call_next(request)
+# Reply skeleton, pre-encoded: a Message with role="agent" and one text part
+_REPLY_PREFIX = b'{"jsonrpc":"2.0","id":'
+_REPLY_MID = b',"result":{"kind":"message","role":"agent","messageId":"'
+_REPLY_PARTS = b'","parts":[{"kind":"text","text":'
+_REPLY_SUFFIX = b'}]}}'
+
+
+def _fast_path_reply(payload: Any) -> bytes | None:
+    """JSON-RPC reply for `message/send`, or None to let the A2A server handle the request."""
+    try:
+        if not (
+            isinstance(payload, dict)
+            and payload.get("jsonrpc") == "2.0"
+            and payload.get("method") in ("message/send", "message.send")
+        ):
+            return None
+        params = payload.get("params") or {}
+        msg = params.get("message") or {}
+        parts = msg.get("parts") or []
+        text = ""
+        for p in parts:
+            if isinstance(p, dict) and p.get("kind") == "text" and p.get("text"):
+                text = p["text"]
+                break
+
+        member_id = extract_member_id(text)
+        result_text = get_profile_overview_encoded(member_id=member_id, query=text)
+
+        # Only id, messageId and the (pre-encoded) text vary; the rest is the fixed template
+        return b"".join((
+            _REPLY_PREFIX, _json_dumps(payload.get("id")),
+            _REPLY_MID, fast_id().encode(),
+            _REPLY_PARTS, result_text,
+            _REPLY_SUFFIX,
+        ))
+    except Exception:
+        # On any parsing error, fall through to default handler
+        return None
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive):
+    """`receive` that hands the already-read body to the downstream app once."""
+    sent = False
+
+    async def replay_receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay_receive
+
+
+class A2AMiddleware:
+    """Request ID, API-key gate, timing and the JSON-RPC fast path as one ASGI layer.
+
+    Replaces four ``@middleware("http")`` layers, each of which added a
+    ``call_next`` hop and rebuilt Request/Response objects per request.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        # Correlation ID: accept an incoming X-Request-ID or generate a new one
+        req_id = key = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                req_id = value
+            elif name == b"x-api-key":
+                key = value
+        if not req_id:
+            req_id = fast_id().encode()
+        scope.setdefault("state", {})["request_id"] = req_id.decode("latin-1")
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # Server-side latency up to the first response byte
+                process_ms = (time.perf_counter() - start) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", req_id),
+                    (b"x-process-time", b"%.2fms" % process_ms),
+                ]
+            await send(message)
+
+        path = scope["path"]
+        if path in _PROTECTED and key != _API_KEY_B:
+            response = JSONResponse({"detail": "Invalid or missing API key"}, status_code=401)
+            await response(scope, receive, send_with_headers)
+            return
+
+        if scope["method"] == "POST" and path == "/":
+            body = await _read_body(receive)
+            # Cheap byte scan first: only bodies that can be message/send get parsed here
+            if b"message/send" in body or b"message.send" in body:
+                try:
+                    payload = _json_loads(body)
+                except ValueError:
+                    payload = None
+                reply = _fast_path_reply(payload)
+                if reply is not None:
+                    response = Response(content=reply, media_type="application/json")
+                    await response(scope, receive, send_with_headers)
+                    return
+                # Not ours after all: hand the parsed dict on with the request
+                scope.setdefault("extensions", {})["parsed_body"] = payload
+            receive = _replay(body, receive)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+fastapi_app.add_middleware(A2AMiddleware)
 
 
 @fastapi_app.get("/healthz")
@@ -198,4 +325,19 @@ def version():
 
 if __name__ == "__main__":
     # Serve A2A over FastAPI with our middlewares and custom endpoints
-    uvicorn.run(fastapi_app, host="0.0.0.0", port=PROFILE_AGENT_PORT)
+    # uvicorn picks uvloop and httptools on its own when they are installed;
+    # per-request access logging is off to keep it out of the hot path.
+    # Requests share no mutable state, so PROFILE_AGENT_WORKERS can fan out to processes.
+    workers = int(os.getenv("PROFILE_AGENT_WORKERS", "1"))
+    if workers > 1:
+        # multiple workers need an import string rather than the app object
+        uvicorn.run(
+            f"{os.path.splitext(os.path.basename(__file__))[0]}:fastapi_app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host="0.0.0.0",
+            port=PROFILE_AGENT_PORT,
+            workers=workers,
+            access_log=False,
+        )
+    else:
+        uvicorn.run(fastapi_app, host="0.0.0.0", port=PROFILE_AGENT_PORT, access_log=False)
@@ -1,6 +1,8 @@
+import logging
 from app.agents.profile_agent import handle_request
 import dotenv
 dotenv.load_dotenv()
+logging.basicConfig(level=logging.INFO)
 
 if __name__ == "__main__":
     t1, o1 = handle_request(
@@ -0,0 +1,30 @@
+from app.utils.intent_keywords import (
+    classify_intent_keywords,
+    classify_intent_keywords_unambiguous,
+)
+
+def test_email_and_address_keywords():
+    assert classify_intent_keywords("Need my email and postal address") == "fetch_email_and_address"
+
+def test_preference_keywords():
+    assert classify_intent_keywords("Show my contact preferences") == "fetch_contact_preference"
+
+def test_mixed_keywords_prefer_email_and_address():
+    assert classify_intent_keywords("email notifications") == "fetch_email_and_address"
+
+def test_no_keywords_defaults_to_preferences():
+    assert classify_intent_keywords("hello") == "fetch_contact_preference"
+
+def test_unambiguous_returns_none_when_tied():
+    assert classify_intent_keywords_unambiguous("email notifications") is None
+    assert classify_intent_keywords_unambiguous("hello") is None
+    assert classify_intent_keywords_unambiguous("my zip code") == "fetch_email_and_address"
+
+def test_unambiguous_requires_whole_words():
+    # substrings of longer words are left to the LLM router
+    assert classify_intent_keywords_unambiguous("what is my statement balance") is None
+    assert classify_intent_keywords_unambiguous("restate my claim") is None
+    assert classify_intent_keywords_unambiguous("explain the context of my claim") is None
+    assert classify_intent_keywords_unambiguous("update my emailing list") is None
+    assert classify_intent_keywords_unambiguous("what state is on file?") == "fetch_email_and_address"
+    assert classify_intent_keywords_unambiguous("send me a text") == "fetch_contact_preference"
@@ -13,4 +13,36 @@ def test_preferences_flow():
         query="Show my contact preferences", member_id="378477398"
     )
     assert tool == "fetch_contact_preference"
-    assert out["data"]["preferences"][0]["preferenceUid"] == "HRA"
\ No newline at end of file
+    assert out["data"]["preferences"][0]["preferenceUid"] == "HRA"
+
+def test_email_and_address_omits_missing_values(monkeypatch):
+    from app.tools import profile_tools
+
+    monkeypatch.setattr(profile_tools, "EMAIL", {
+        "email": [{"emailUid": "E1", "emailAddress": None}]
+    })
+    monkeypatch.setattr(profile_tools, "ADDR", {
+        "address": [{
+            "addressUid": "A1",
+            "addressTypeCd": {"code": "HOME"},
+            "addressLineOne": "1 Main St",
+            "city": None,
+            "stateCd": {"code": None},
+            "zipCd": "44012",
+        }]
+    })
+    tool, out = handle_request(
+        query="Need my email and postal address", member_id="378477398"
+    )
+    assert tool == "fetch_email_and_address"
+    # rows whose value is None are left out, not emitted with an empty value
+    assert out["data"]["email"] == []
+    assert out["data"]["address"] == [
+        {"name": "Address Type Cd", "value": "HOME"},
+        {"name": "Address Line One: ", "value": "1 Main St"},
+        {"name": "ZipCd: ", "value": "44012"},
+    ]
+    assert out["entities"] == [
+        {"name": "emailUid", "value": "E1"},
+        {"name": "addressUid", "value": "A1"},
+    ]